@@ -15,7 +15,7 @@
    - region: 첫 단어만, 첫 글자 대문자 / Quarantine 제거
    - 누락 날짜: 직전 누적값으로 채움(ffill)
    - 누적 -> 일일 증분(confirm1/death1/released1)
-2) 전처리 결과를 kr_covid_temp.txt로 저장
+2) 전처리 결과를 kr_covid_temp.parquet로 저장(다음 실행부터는 CSV가 바뀌지 않았으면 바로 읽기)
 3) Dash 웹앱 실행
    - 드롭다운1: 확진자/사망자/완치자
    - 드롭다운2: 매일/주간/월간/분기ㅔㅛ
@@ -24,7 +24,7 @@
 
 실행 방법
 - 설치:
-    pip install pandas numpy plotly dash
+    pip install pandas numpy pyarrow plotly dash
 - 실행:
     python covid_bubble_chart.py
 - 브라우저:
@@ -35,6 +35,7 @@
 # 0) Imports (파일 최상단)
 # ============================================================
 from pathlib import Path
+import base64
 import webbrowser
 import threading
 
@@ -44,159 +45,332 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
-from dash import Dash, dcc, html
+from dash import Dash, Patch, dcc, html, no_update
 from dash.dependencies import Input, Output, State
 
+# (선택) waitress가 설치되어 있으면 Flask 개발 서버 대신 멀티스레드 WSGI 서버로 실행
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
 
 # ============================================================
 # 1) 전처리: CSV(누적) -> 일일 증분 + 누락 날짜 보정 + 파일 저장
 # ============================================================
-def preprocess_and_save(
-    input_csv: str = "data/kr_regional_daily_excel.csv",
-    output_txt: str = "kr_covid_temp.txt",
-) -> pd.DataFrame:
-    """요구사항의 전처리를 수행하고 결과를 파일로 저장합니다."""
-
-    # (1) CSV 읽기
-    df = pd.read_csv(input_csv)
-
-    # (2) date 처리: YYYYMMDD -> datetime -> YYYY-MM-DD
-    df["date"] = df["date"].astype(str).str.strip()
-    df["date_dt"] = pd.to_datetime(df["date"], format="%Y%m%d", errors="coerce")
-    df = df.dropna(subset=["date_dt"]).copy()
-    df["date1"] = df["date_dt"].dt.strftime("%Y-%m-%d")
+def _read_and_normalize_polars(input_csv: str) -> pd.DataFrame:
+    """polars로 CSV 읽기 + date/region 정규화 + Quarantine 제거 후 pandas로 변환합니다."""
+    # (선택) polars는 engine="polars"일 때만 필요 → 앱 시작 시간에 영향이 없도록 여기서 import
+    try:
+        import polars as pl
+    except ImportError:
+        raise ImportError("engine='polars'를 사용하려면 polars를 설치하세요: pip install polars") from None
+
+    # 첫 단어만 + 첫 글자 대문자(나머지 소문자) → str.capitalize()와 동일한 결과
+    token = pl.col("region").cast(pl.Utf8).str.strip_chars().str.extract(r"^(\S+)", 1)
+    region1 = pl.concat_str([token.str.slice(0, 1).str.to_uppercase(), token.str.slice(1).str.to_lowercase()])
+
+    out = (
+        pl.read_csv(input_csv)
+        .with_columns(
+            pl.col("date").cast(pl.Utf8).str.strip_chars()
+            .str.strptime(pl.Date, format="%Y%m%d", strict=False).alias("date_dt"),
+            region1.alias("region1"),
+            *[pl.col(c).cast(pl.Float64, strict=False) for c in ["confirmed", "death", "released"]],
+        )
+        .drop_nulls("date_dt")
+        .filter(pl.col("region1") != "Quarantine")
+        .select(["date_dt", "region1", "confirmed", "death", "released"])
+        .to_pandas()
+    )
+    # polars Date는 datetime64[ms]로 변환됨 → pd.date_range(ns)와 재색인 시 단위를 맞춤
+    out["date_dt"] = out["date_dt"].astype("datetime64[ns]")
+    return out
 
-    # (3) region 처리: 첫 단어만 + 첫 글자 대문자 / Quarantine 제거
-    def normalize_region(x) -> str:
-        token = str(x).strip().split()[0]
-        return token.lower().capitalize()
 
-    df["region1"] = df["region"].apply(normalize_region)
-    df = df[df["region1"] != "Quarantine"].copy()
+def _daily_delta_numpy(cum: np.ndarray, n_dates: int) -> np.ndarray:
+    """(지역 x 날짜) 순으로 정렬된 누적값 → 일일 증분(int32).
 
-    # (4) 누적 컬럼을 숫자로 변환
-    for c in ["confirmed", "death", "released"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+    지역별 첫날은 누적값 자체, 음수(정정 데이터)는 0
+    """
+    # 지역/날짜 순으로 정렬되어 있으므로 groupby 없이 numpy 차분 한 번으로 계산
+    delta = np.empty_like(cum)
+    delta[:1] = cum[:1]
+    delta[1:] = cum[1:] - cum[:-1]
 
-    # (5) 지역별 누락 날짜 보정
-    all_dates = pd.date_range(df["date_dt"].min(), df["date_dt"].max(), freq="D")
+    # 지역별 첫날은 이전 지역과의 차이가 되므로 → 누적값 자체 사용
+    first_idx = np.arange(n_dates, len(cum), n_dates)
+    delta[first_idx] = cum[first_idx]
 
-    filled = []
-    for region, g in df.sort_values("date_dt").groupby("region1"):
-        # 지역별로 전체 날짜에 맞춰 재색인
-        g = g.set_index("date_dt").reindex(all_dates)
-        g["region1"] = region
+    # 음수(정정 데이터) 방지
+    np.clip(delta, 0, None, out=delta)
+    return delta.round().astype(np.int32)
 
-        # 누적값은 직전값으로 채우기 (요구사항)
-        g[["confirmed", "death", "released"]] = (
-            g[["confirmed", "death", "released"]].ffill().fillna(0)
-        )
 
-        g = g.reset_index().rename(columns={"index": "date_dt"})
-        g["date1"] = g["date_dt"].dt.strftime("%Y-%m-%d")
-        filled.append(g)
+def preprocess_and_save(
+    input_csv: str = "data/kr_regional_daily_excel.csv",
+    output_txt: str = "kr_covid_temp.parquet",
+    engine: str = "pandas",
+) -> pd.DataFrame:
+    """요구사항의 전처리를 수행하고 결과를 파일로 저장합니다.
 
-    df_full = pd.concat(filled, ignore_index=True)
-    df_full = df_full.sort_values(["region1", "date_dt"]).copy()
+    engine="polars": (1)~(4) 읽기/정규화/필터를 polars로 수행(pip install polars 필요)
+    """
 
-    # (6) 누적 -> 일일 증분(차이)
-    delta = df_full.groupby("region1")[["confirmed", "death", "released"]].diff()
+    if engine == "polars":
+        df = _read_and_normalize_polars(input_csv)
+    else:
+        # (1) CSV 읽기: pyarrow(C++ 멀티스레드) CSV 파서 + 컬럼 타입 지정(타입 추론/사후 변환 생략)
+        # - date: 처음부터 문자열로 읽음(정수로 읽었다가 str로 다시 바꾸지 않음)
+        # - 누적 컬럼: 뒤에서 float 배열로 채우므로 float64로 바로 읽음(빈 칸은 NaN)
+        df = pd.read_csv(
+            input_csv,
+            engine="pyarrow",
+            dtype={"date": "str", "region": "str", "confirmed": "float64", "death": "float64", "released": "float64"},
+        )
 
-    # 지역별 첫날은 diff가 NaN → 누적값 자체 사용
-    first_mask = df_full.groupby("region1").cumcount().eq(0)
-    delta.loc[first_mask, :] = df_full.loc[first_mask, ["confirmed", "death", "released"]].values
+        # (2) date 처리: YYYYMMDD -> datetime
+        # - 'YYYY-MM-DD' 문자열(date1)은 결과 생성 시 날짜수만큼만 포맷 → 원본 행마다 strftime 하지 않음
+        df["date"] = df["date"].str.strip()
+        df["date_dt"] = pd.to_datetime(df["date"], format="%Y%m%d", errors="coerce")
 
-    # 음수(정정 데이터) 방지
-    delta = delta.clip(lower=0)
+        # (3) region 처리: 첫 단어만 + 첫 글자 대문자 / Quarantine 제거
+        # - 행마다 Python 함수를 부르지 않고 pandas 문자열 연산으로 한 번에 처리
+        # - capitalize(): 첫 글자 대문자 + 나머지 소문자
+        df["region1"] = df["region"].str.strip().str.split(n=1).str[0].str.capitalize()
 
-    df_full["confirm1"] = delta["confirmed"].round().astype(int)
-    df_full["death1"] = delta["death"].round().astype(int)
-    df_full["released1"] = delta["released"].round().astype(int)
+        # 날짜 파싱 실패 행과 Quarantine 행을 한 번의 마스크로 제거
+        # - 이후로는 읽기만 하므로 .copy()로 전체 프레임을 복사하지 않음
+        df = df[df["date_dt"].notna() & (df["region1"] != "Quarantine")]
 
-    out = df_full[["date1", "region1", "confirm1", "death1", "released1"]].copy()
+    # (4) 지역별 누락 날짜 보정
+    all_dates = pd.date_range(df["date_dt"].min(), df["date_dt"].max(), freq="D")
+    regions = sorted(df["region1"].unique())
+    n_dates, n_rows = len(all_dates), len(all_dates) * len(regions)
+
+    # (지역 x 전체 날짜) 크기의 배열을 한 번만 할당하고 원본 행을 제자리에 채우기
+    # 행 위치 = 지역코드 * 날짜수 + (날짜 - 시작일) → 지역/날짜 순으로 정렬된 상태
+    region_code = pd.Categorical(df["region1"], categories=regions).codes.astype(np.int64)
+    day_pos = (df["date_dt"] - all_dates[0]).dt.days.to_numpy()
+    arr = np.full((n_rows, 3), np.nan)
+    arr[region_code * n_dates + day_pos] = df[["confirmed", "death", "released"]].to_numpy(dtype=float)
+
+    # 누적값은 직전값으로 채우기 (요구사항)
+    # 지역 첫 행부터 '마지막 유효 행 위치'를 누적 최대값으로 전파 → 지역 경계를 넘지 않음
+    last = np.where(np.isnan(arr), 0, np.arange(n_rows)[:, None])
+    last[::n_dates] = np.arange(0, n_rows, n_dates)[:, None]
+    np.maximum.accumulate(last, axis=0, out=last)
+    arr = np.nan_to_num(np.take_along_axis(arr, last, axis=0), copy=False)
+
+    # (5) 누적 -> 일일 증분(차이)
+    delta = _daily_delta_numpy(arr, n_dates)
+
+    # 결과 DataFrame은 완성된 배열로 한 번에 생성 (날짜 문자열도 날짜수만큼만 포맷 후 반복)
+    # 일일 증분은 int32로 충분 → 이후 집계(groupby)에서 읽는 바이트 수를 절반으로
+    # date_dt(datetime64)도 함께 저장 → 읽을 때 날짜 재파싱 불필요
+    # region1은 17개 정도의 값이 반복 → category(정수 코드)로 저장해 groupby/isin이 코드 기준으로 동작
+    out = pd.DataFrame(
+        {
+            "date1": np.tile(all_dates.strftime("%Y-%m-%d").to_numpy(), len(regions)),
+            "date_dt": np.tile(all_dates.to_numpy(), len(regions)),
+            "region1": pd.Categorical.from_codes(np.repeat(np.arange(len(regions)), n_dates), categories=regions),
+            "confirm1": delta[:, 0],
+            "death1": delta[:, 1],
+            "released1": delta[:, 2],
+        }
+    )
 
-    # (2) 파일 저장
-    out.to_csv(output_txt, index=False, sep=",")
+    # (2) 파일 저장: Parquet(컬럼형, dtype 보존)
+    out.to_parquet(output_txt, engine="pyarrow", compression="zstd", index=False)
     return out
 
 
 # ============================================================
 # 2) 기간 집계: 매일/주간/월간/분기
 # ============================================================
-def aggregate_by_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
-    """period(day/weekly/monthly/quarterly)에 따라 합계를 집계합니다."""
-    temp = df.copy()
-    temp["date_dt"] = pd.to_datetime(temp["date1"])  # 집계용 datetime
+# period -> pd.Grouper 주기
+# - 주간: 월요일 시작 주(W-MON 기본값은 월요일에 '끝나는' 주 → closed/label을 left로)
+# - 월간/분기: 해당 기간의 첫날(MS/QS)
+PERIOD_GROUPERS = {
+    "day": {"freq": "D"},
+    "weekly": {"freq": "W-MON", "closed": "left", "label": "left"},
+    "monthly": {"freq": "MS"},
+    "quarterly": {"freq": "QS"},
+}
 
-    if period == "day":
-        return temp.groupby(["region1", "date_dt"], as_index=False)[["confirm1", "death1", "released1"]].sum()
 
-    if period == "weekly":
-        # 주 시작(월요일)으로 정규화
-        temp["date_dt"] = temp["date_dt"] - pd.to_timedelta(temp["date_dt"].dt.weekday, unit="D")
-        return temp.groupby(["region1", "date_dt"], as_index=False)[["confirm1", "death1", "released1"]].sum()
+def aggregate_by_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """period(day/weekly/monthly/quarterly)에 따라 합계를 집계합니다.
+
+    날짜 구간 나누기는 pd.Grouper가 groupby 안에서 처리(날짜 컬럼을 새로 만들지 않음).
+    """
+    if period not in PERIOD_GROUPERS:
+        raise ValueError("period must be one of: day, weekly, monthly, quarterly")
 
-    if period == "monthly":
-        temp["date_dt"] = temp["date_dt"].dt.to_period("M").dt.to_timestamp()
-        return temp.groupby(["region1", "date_dt"], as_index=False)[["confirm1", "death1", "released1"]].sum()
+    cols = ["confirm1", "death1", "released1"]
+    if period == "day":
+        # 전처리 결과는 (지역, 날짜)마다 정확히 한 행이고 그 순서로 정렬돼 있음
+        # → 일 단위 합계는 원본과 같으므로 groupby 없이 필요한 컬럼만 그대로 사용
+        return df[["region1", "date_dt", *cols]].reset_index(drop=True)
 
-    if period == "quarterly":
-        temp["date_dt"] = temp["date_dt"].dt.to_period("Q").dt.to_timestamp()
-        return temp.groupby(["region1", "date_dt"], as_index=False)[["confirm1", "death1", "released1"]].sum()
+    grouper = pd.Grouper(key="date_dt", **PERIOD_GROUPERS[period])
 
-    raise ValueError("period must be one of: day, weekly, monthly, quarterly")
+    # 기간별 합계는 앱 시작 시 기간마다 한 번만 계산 → 기본(Cython) 엔진이 numba JIT 컴파일보다 빠름
+    # groupby 키 정렬 덕분에 결과는 (region1, date_dt) 순 → 호출하는 쪽에서 다시 정렬할 필요 없음
+    # (int32 합계는 int32 그대로 유지됨)
+    return df.groupby(["region1", grouper], observed=True)[cols].sum().reset_index()
 
 
 # ============================================================
 # 3) 버블 크기: sqrt 스케일 + 선택된 값 범위(min/max)로 다시 스케일
 # ============================================================
-def make_marker_arrays(values: np.ndarray, min_px: int = 6, max_px: int = 85):
+def make_marker_arrays(
+    values: np.ndarray,
+    min_px: int = 6,
+    max_px: int = 85,
+    starts: np.ndarray | None = None,
+):
     """버블 크기/투명도/hover용 customdata 생성.
 
     - sqrt 스케일: 큰 값이 너무 커지는 문제를 줄임
     - BUT hover는 실제 값이 필요 → customdata[0]에 원본 값 저장
     - 0 값은 표시하지 않음(opacity=0)
     - 선택된 데이터 범위(min/max)를 기준으로 size를 매번 다시 스케일(극적 표현)
+    - starts: 여러 지역을 이어 붙인 배열일 때 각 지역의 시작 위치
+      → 지역마다 따로 부르지 않고 한 번에 계산(min/max는 지역별로 따로 적용)
     """
-    v = np.asarray(values, dtype=float)
+    values = np.asarray(values)
+    mask = values > 0  # 한 번만 계산해서 재사용
+
+    # hover에 쓸 실제 값 저장 (1열 2D → customdata[0])
+    # 집계 값은 이미 int32 → float 배열을 거치지 않고 원본 배열의 view로 만듦(복사 없음)
+    customdata = values.astype(np.int32, copy=False).reshape(-1, 1)
+
+    # 0이면 완전 숨김 (브라우저로 보내는 배열은 float32 → 직렬화 크기 절반)
+    opacity = np.where(mask, np.float32(0.85), np.float32(0.0))
+
+    # sqrt 스케일(시각적 완화): 결과 버퍼(size)에 바로 쓰고 이후 단계도 out=으로 제자리 갱신
+    # → 단계마다 임시 배열을 만들지 않음, 0인 점은 계산하지 않고 0 유지
+    size = np.sqrt(values, where=mask, out=np.zeros(len(values)))
+    if not mask.any():
+        return size.astype(np.float32), opacity, customdata
+
+    # 구간(지역)별 min/max: 0인 점은 +inf/-inf로 두어 reduceat에서 제외 (버퍼 하나를 재사용)
+    if starts is None:
+        starts = np.zeros(1, dtype=np.intp)
+    masked = np.where(mask, size, np.inf)
+    s_min = np.minimum.reduceat(masked, starts)
+    masked[~mask] = -np.inf
+    s_max = np.maximum.reduceat(masked, starts)
+    counts = np.diff(starts, append=len(values))
+    span = np.repeat(s_max - s_min, counts)
+
+    # min~max 정규화 후 픽셀 크기로 맵핑: (s - min) / (max - min) * (max_px - min_px) + min_px
+    # 값이 하나뿐인 구간(max == min)은 중간 크기
+    scaled = mask & (span > 0)
+    np.subtract(size, np.repeat(s_min, counts), out=size, where=mask)
+    np.divide(size, span, out=size, where=scaled)
+    np.multiply(size, max_px - min_px, out=size, where=scaled)
+    np.add(size, min_px, out=size, where=scaled)
+    size[mask & ~scaled] = (min_px + max_px) / 2
+    # 픽셀 크기라 float32 정밀도로 충분 → Figure/Patch JSON에 실리는 바이트 수 절반
+    return size.astype(np.float32), opacity, customdata
+
+
+def typed_array(a: np.ndarray) -> dict:
+    """numpy 배열 → plotly.js typed array 형식({dtype, bdata[, shape]}).
+
+    Figure는 Plotly가 알아서 이 형식으로 직렬화하지만 Patch 값은 숫자 리스트(JSON)로 나가므로 직접 변환
+    """
+    a = np.ascontiguousarray(a)
+    spec = {"dtype": a.dtype.str[1:], "bdata": base64.b64encode(a).decode("ascii")}
+    if a.ndim > 1:
+        spec["shape"] = ", ".join(map(str, a.shape))
+    return spec
 
-    # hover에 쓸 실제 값 저장
-    customdata = np.column_stack([v.astype(int)])
 
-    # 0이면 완전 숨김
-    opacity = np.where(v > 0, 0.85, 0.0)
+# ============================================================
+# 4) Figure 생성: hover 텍스트(한글) 반영 + 제목 그래프 내부 + 타이틀 제거
+# ============================================================
+# ----------------------------
+# (요구사항) 드롭다운 값 -> 한글 라벨 매핑
+# - hover 텍스트도 이 라벨을 사용(요청사항)
+# ----------------------------
+METRIC_LABELS = {
+    "confirm1": "확진자",
+    "death1": "사망자",
+    "released1": "완치자",
+}
+PERIOD_LABELS = {
+    "day": "매일",
+    "weekly": "주간",
+    "monthly": "월간",
+    "quarterly": "분기",
+}
 
-    # sqrt 스케일(시각적 완화)
-    s = np.sqrt(v)
 
-    nz = s[v > 0]
-    if len(nz) == 0:
-        return np.zeros_like(s), opacity, customdata
+def make_color_map(all_regions: list[str]) -> dict[str, str]:
+    """region별 고정 색상(Plotly 기본 팔레트 순환)."""
+    palette = px.colors.qualitative.Plotly
+    return {r: palette[i % len(palette)] for i, r in enumerate(all_regions)}
 
-    s_min, s_max = nz.min(), nz.max()
-    if s_max == s_min:
-        size = np.where(v > 0, (min_px + max_px) / 2, 0)
-        return size, opacity, customdata
 
-    # min~max 정규화 후 픽셀 크기로 맵핑
-    size = np.where(
-        v > 0,
-        min_px + (s - s_min) / (s_max - s_min) * (max_px - min_px),
-        0
+def region_trace_props(
+    dates: np.ndarray,
+    values: np.ndarray,
+    region: str,
+    metric: str,
+    period: str,
+    min_px: float = 6,
+    max_px: float = 85,
+    marker_arrays: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+) -> dict:
+    """지역 하나의 trace에서 (지표, 기간)에 따라 바뀌는 속성만 계산합니다.
+
+    build_figure(처음 그릴 때)와 콜백의 Patch(부분 갱신)가 같은 값을 쓰도록 한 곳에 모음
+    marker_arrays: 여러 지역을 한 번에 계산해 둔 (size, opacity, customdata) 중 이 지역 부분
+    """
+    if marker_arrays is None:
+        marker_arrays = make_marker_arrays(values, min_px=min_px, max_px=max_px)
+    size, opacity, customdata = marker_arrays
+
+    # -------------------------------------------------
+    # ✅ Hover 텍스트(한글 라벨) 변경
+    # - 'metric' 변수명(confirm1 등)이 아니라 '확진자/사망자/완치자'로 출력
+    # - 'period'도 '매일/주간/월간/분기'로 출력
+    # - 값은 customdata[0]로 실제값 표시(단위: 명)
+    # -------------------------------------------------
+    hover = (
+        "날짜: %{x|%Y-%m-%d}<br>"
+        "지역: %{y}<br>"
+        + "기간: " + PERIOD_LABELS.get(period, period) + "<br>"
+        + METRIC_LABELS.get(metric, metric) + ": %{customdata[0]}명"
+        "<extra></extra>"
     )
-    return size, opacity, customdata
+
+    return {
+        "x": dates,
+        "y": [region] * len(dates),
+        "customdata": customdata,
+        "hovertemplate": hover,
+        "marker": {"size": size, "opacity": opacity},
+    }
 
 
-# ============================================================
-# 4) Figure 생성: hover 텍스트(한글) 반영 + 제목 그래프 내부 + 타이틀 제거
-# ============================================================
 def build_figure(
     df_temp: pd.DataFrame,
     selected_regions: list[str],
     metric: str,
     period: str,
+    agg_cache: dict[str, pd.DataFrame] | None = None,
+    color_map: dict[str, str] | None = None,
+    x_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
 ) -> go.Figure:
-    """선택 조건에 맞춰 Figure를 새로 생성합니다."""
+    """선택 조건에 맞춰 Figure를 새로 생성합니다.
+
+    agg_cache: period별로 미리 집계해 둔 DataFrame(있으면 groupby를 다시 하지 않음)
+    color_map / x_range: 콜백마다 변하지 않는 값 → Dash 앱 시작 시 한 번만 계산해서 전달
+    """
 
     # ----------------------------
     # (요구사항) 그래프 속성 정의
@@ -218,90 +392,69 @@ def build_figure(
         "max_px": 85,
     }
 
-    # ----------------------------
-    # (요구사항) 드롭다운 값 -> 한글 라벨 매핑
-    # - hover 텍스트도 이 라벨을 사용(요청사항)
-    # ----------------------------
-    METRIC_LABELS = {
-        "confirm1": "확진자",
-        "death1": "사망자",
-        "released1": "완치자",
-    }
-    PERIOD_LABELS = {
-        "day": "매일",
-        "weekly": "주간",
-        "monthly": "월간",
-        "quarterly": "분기",
-    }
-    metric_label = METRIC_LABELS.get(metric, metric)
-    period_label = PERIOD_LABELS.get(period, period)
-
     # ----------------------------
     # period 집계 후 지역 필터
     # ----------------------------
-    agg = aggregate_by_period(df_temp, period)
+    if agg_cache is not None:
+        agg = agg_cache[period]
+    else:
+        agg = aggregate_by_period(df_temp, period)
+
+    # 지역 -> 행 위치를 한 번의 groupby로 얻고, 지역 필터도 이 딕셔너리에서 처리
+    # (isin 마스크/부분 DataFrame을 만들지 않고 numpy 배열을 위치로만 잘라 씀)
+    region_rows = agg.groupby("region1", sort=False, observed=True).indices
     if selected_regions:
-        agg = agg[agg["region1"].isin(selected_regions)].copy()
+        region_rows = {r: region_rows[r] for r in selected_regions if r in region_rows}
 
-    # X축 MIN/MAX는 전체 date1 기준(요구사항)
-    all_dt = pd.to_datetime(df_temp["date1"])
-    x_min, x_max = all_dt.min(), all_dt.max()
+    # X축 MIN/MAX는 전체 날짜 기준(요구사항)
+    if x_range is None:
+        x_range = (df_temp["date_dt"].min(), df_temp["date_dt"].max())
+    x_min, x_max = x_range
 
     # Y축 카테고리는 선택 지역만
-    regions = sorted(agg["region1"].unique())
+    regions = sorted(region_rows)
 
     # region별 색상 고정
-    all_regions = sorted(df_temp["region1"].unique())
-    palette = px.colors.qualitative.Plotly
-    color_map = {r: palette[i % len(palette)] for i, r in enumerate(all_regions)}
-
-    fig = go.Figure()
-
-    # region별 trace 생성
-    for r in regions:
-        sub = agg[agg["region1"] == r].sort_values("date_dt").copy()
-
-        size, opacity, customdata = make_marker_arrays(
-            sub[metric].values,
-            min_px=STYLE["min_px"],
-            max_px=STYLE["max_px"],
-        )
-
-        # -------------------------------------------------
-        # ✅ Hover 텍스트(한글 라벨) 변경
-        # - 'metric' 변수명(confirm1 등)이 아니라 '확진자/사망자/완치자'로 출력
-        # - 'period'도 '매일/주간/월간/분기'로 출력
-        # - 값은 customdata[0]로 실제값 표시(단위: 명)
-        # -------------------------------------------------
-        hover = (
-            "날짜: %{x|%Y-%m-%d}<br>"
-            "지역: %{y}<br>"
-            + "기간: " + period_label + "<br>"
-            + metric_label + ": %{customdata[0]}명"
-            "<extra></extra>"
+    if color_map is None:
+        color_map = make_color_map(sorted(df_temp["region1"].unique()))
+
+    # region별 trace 생성: 집계 결과는 이미 (region1, date_dt) 순으로 정렬돼 있으므로
+    # 지역별 행 위치로 자르기만 하면 날짜 순 배열이 됨
+    # 버블 크기는 선택 지역 전체를 이어 붙여 한 번에 계산(스케일 범위는 지역별)
+    rows = [region_rows[r] for r in regions]
+    starts = np.cumsum([0] + [len(idx) for idx in rows[:-1]])
+    rows = np.concatenate(rows) if rows else np.array([], dtype=np.intp)
+    dates, values = agg["date_dt"].to_numpy()[rows], agg[metric].to_numpy()[rows]
+    size, opacity, customdata = make_marker_arrays(
+        values, min_px=STYLE["min_px"], max_px=STYLE["max_px"], starts=starts
+    )
+    # trace는 리스트로 모아 Figure 생성 시 한 번에 전달(add_trace 반복 호출 없음)
+    traces = []
+    for r, lo, hi in zip(regions, starts, np.append(starts[1:], len(rows))):
+        props = region_trace_props(
+            dates[lo:hi], values[lo:hi], r, metric, period,
+            marker_arrays=(size[lo:hi], opacity[lo:hi], customdata[lo:hi]),
         )
+        marker = props.pop("marker")
 
-        fig.add_trace(
-            go.Scatter(
-                x=sub["date_dt"],
-                y=[r] * len(sub),
+        # Scattergl: SVG 대신 WebGL로 그려서 지역 x 날짜 점이 많아도 렌더링이 빠름
+        traces.append(
+            go.Scattergl(
                 mode="markers",
                 name=r,
                 marker=dict(
-                    size=size,
-                    opacity=opacity,
+                    **marker,
                     color=color_map.get(r, "#636EFA"),
                     sizemode="diameter",
                     sizemin=2,
                     line=dict(width=1, color=STYLE["gridcolor"])
                 ),
-                customdata=customdata,
-                hovertemplate=hover,
+                **props,
             )
         )
 
-    # 레이아웃: 제목 내부 배치, 타이틀 제거
-    fig.update_layout(
+    # 레이아웃: 제목 내부 배치, 타이틀 제거 (Figure 생성 시 함께 전달 → update_layout 검증을 따로 하지 않음)
+    layout = go.Layout(
         title=dict(
             text=STYLE["title"],
             x=0.5,
@@ -339,7 +492,7 @@ def build_figure(
         hovermode="closest",
     )
 
-    return fig
+    return go.Figure(data=traces, layout=layout)
 
 
 # ============================================================
@@ -361,7 +514,33 @@ def run_dash_app(df_temp: pd.DataFrame, host: str = "127.0.0.1", port: int = 805
         {"label": "분기", "value": "quarterly"},
     ]
 
+    # 콜백마다 변하지 않는 값(지역 목록/색상/X축 범위)은 한 번만 계산
     all_regions = sorted(df_temp["region1"].unique())
+    color_map = make_color_map(all_regions)
+    x_range = (df_temp["date_dt"].min(), df_temp["date_dt"].max())
+
+    # 기간 집계는 period에만 의존 → 4가지를 시작 시 한 번만 계산해 두고 콜백에서는 지역 필터만 수행
+    agg_cache = {opt["value"]: aggregate_by_period(df_temp, opt["value"]) for opt in period_options}
+
+    # 콜백용: period -> region -> 컬럼 -> numpy 배열 (지역별로 미리 잘라 둠)
+    # → 콜백에서는 DataFrame 마스크/정렬 없이 딕셔너리 조회만
+    # 버블 크기/투명도/customdata도 (기간, 지표)마다 전체 지역을 한 번에 계산해 둠(12번의 벡터 연산)
+    # → 스케일 기준이 지역별이라 선택 지역과 무관하므로 콜백에서는 계산 없이 잘라 둔 배열만 사용
+    metrics = [opt["value"] for opt in metric_options]
+    region_arrays = {}
+    for period, agg in agg_cache.items():
+        # 집계 결과는 (region1, date_dt) 순 → 지역별 행은 연속 구간
+        bounds = {r: (idx[0], idx[-1] + 1) for r, idx in agg.groupby("region1", sort=False, observed=True).indices.items()}
+        starts = np.array([lo for lo, _ in bounds.values()], dtype=np.intp)
+        columns = {c: agg[c].to_numpy() for c in ["date_dt", *metrics]}
+        markers = {m: make_marker_arrays(columns[m], starts=starts) for m in metrics}
+        region_arrays[period] = {
+            r: {
+                **{c: col[lo:hi] for c, col in columns.items()},
+                "markers": {m: tuple(a[lo:hi] for a in markers[m]) for m in metrics},
+            }
+            for r, (lo, hi) in bounds.items()
+        }
 
     app = Dash(__name__)
 
@@ -438,9 +617,17 @@ def run_dash_app(df_temp: pd.DataFrame, host: str = "127.0.0.1", port: int = 805
                         children=[
                             dcc.Graph(
                                 id="chart",
-                                figure=build_figure(df_temp, all_regions, "confirm1", "day"),
+                                figure=build_figure(
+                                    df_temp, all_regions, "confirm1", "day", agg_cache, color_map, x_range
+                                ),
                                 config={"displayModeBar": True},
-                            )
+                            ),
+                            # 그래프는 전체 지역 trace를 항상 유지 → 어떤 (지표, 기간)의 값이
+                            # 어느 지역 trace에 들어 있는지 기억해 두고 콜백에서는 Patch만 전송
+                            dcc.Store(
+                                id="chart-state",
+                                data={"metric": "confirm1", "period": "day", "fresh": all_regions},
+                            ),
                         ],
                     ),
                 ],
@@ -448,20 +635,65 @@ def run_dash_app(df_temp: pd.DataFrame, host: str = "127.0.0.1", port: int = 805
         ],
     )
 
+    # trace 순서 = all_regions 순서(처음 그린 Figure 기준)
+    trace_index = {r: i for i, r in enumerate(all_regions)}
+
+    # (지역, 지표, 기간)별 trace 값은 region_arrays에 미리 계산되어 있음 → 여기서는 꺼내서 묶기만 함
+    # (계산할 것이 없으므로 별도 캐시도 두지 않음)
+    def _trace_props(region: str, metric: str, period: str) -> dict:
+        arrays = region_arrays[period][region]
+        return region_trace_props(
+            arrays["date_dt"], arrays[metric], region, metric, period,
+            marker_arrays=arrays["markers"][metric],
+        )
+
     # Callback: 확인 버튼 클릭 시만 반영
+    # - 페이지 로드 시에는 레이아웃의 Figure가 이미 초기 선택(전체 지역/확진자/매일) 상태
+    #   → 같은 결과를 다시 계산/전송하지 않도록 첫 호출은 건너뜀
     @app.callback(
         Output("chart", "figure"),
+        Output("chart-state", "data"),
         Input("apply", "n_clicks"),
         State("regions", "value"),
         State("metric", "value"),
         State("period", "value"),
-        prevent_initial_call=False,
+        State("chart-state", "data"),
+        prevent_initial_call=True,
     )
-    def update_chart(n_clicks, selected_regions, metric, period):
+    def update_chart(n_clicks, selected_regions, metric, period, chart_state):
         if not selected_regions:
             # 아무것도 선택 안 하면 최소 1개는 남기기
-            selected_regions = [sorted(df_temp["region1"].unique())[0]]
-        return build_figure(df_temp, selected_regions, metric, period)
+            selected_regions = [all_regions[0]]
+        selected = sorted(selected_regions)
+
+        # 지표/기간이 바뀌면 모든 trace 값이 낡은 값 → 선택된 지역부터 다시 채움
+        fresh = set()
+        if chart_state and chart_state["metric"] == metric and chart_state["period"] == period:
+            fresh = set(chart_state["fresh"])
+        stale = [r for r in selected if r not in fresh]
+
+        # Figure를 새로 만들지 않고 바뀐 부분만 Patch로 전송
+        # - 낡은 선택 지역: x/y/버블 크기/투명도/customdata/hover만 교체
+        # - 전체 지역: 표시 여부, Y축 카테고리
+        # (지역별 버블 크기는 그 지역 값으로만 스케일되므로 이미 채워진 trace는 그대로 재사용 가능)
+        patch = Patch()
+        for r in stale:
+            props = _trace_props(r, metric, period)
+            trace = patch["data"][trace_index[r]]
+            trace["x"] = props["x"]
+            trace["y"] = props["y"]
+            # 숫자 배열은 base64 typed array로 전송 (숫자 리스트 JSON보다 작음)
+            trace["customdata"] = typed_array(props["customdata"])
+            trace["hovertemplate"] = props["hovertemplate"]
+            trace["marker"]["size"] = typed_array(props["marker"]["size"])
+            trace["marker"]["opacity"] = typed_array(props["marker"]["opacity"])
+        for r, i in trace_index.items():
+            patch["data"][i]["visible"] = r in selected
+        patch["layout"]["yaxis"]["categoryarray"] = selected
+
+        if not stale:
+            return patch, no_update
+        return patch, {"metric": metric, "period": period, "fresh": sorted(fresh.union(stale))}
 
     url = f"http://{host}:{port}"
     print("\n" + "=" * 70)
@@ -481,21 +713,28 @@ def run_dash_app(df_temp: pd.DataFrame, host: str = "127.0.0.1", port: int = 805
         threading.Thread(target=_open, daemon=True).start()
 
     #app.run(debug=False)
-    app.run(host=host, port=port, debug=False)
+    if serve is not None:
+        # 여러 사용자가 동시에 [확인]을 눌러도 콜백이 한 줄로 밀리지 않도록 스레드 여러 개로 처리
+        serve(app.server, host=host, port=port, threads=8)
+    else:
+        app.run(host=host, port=port, debug=False)
 
 # ============================================================
 # 6) main
 # ============================================================
 if __name__ == "__main__":
     INPUT_CSV = "covid-dashboard\\data\\kr_regional_daily_excel.csv"
-    OUTPUT_TXT = "kr_covid_temp.txt"
-
-    # 전처리 파일이 없으면 생성
-    if not Path(OUTPUT_TXT).exists():
-        preprocess_and_save(INPUT_CSV, OUTPUT_TXT)
-
-    # 가공 파일 읽기
-    df_temp = pd.read_csv(OUTPUT_TXT)
+    OUTPUT_TXT = "kr_covid_temp.parquet"
+
+    # 전처리 파일이 없거나 원본 CSV보다 오래됐으면 다시 생성(결과를 바로 사용)
+    # 최신이면 CSV 전처리 없이 Parquet만 읽기
+    cache_path, csv_path = Path(OUTPUT_TXT), Path(INPUT_CSV)
+    if not cache_path.exists() or (
+        csv_path.exists() and cache_path.stat().st_mtime < csv_path.stat().st_mtime
+    ):
+        df_temp = preprocess_and_save(INPUT_CSV, OUTPUT_TXT)
+    else:
+        df_temp = pd.read_parquet(OUTPUT_TXT)
 
     # Dash 앱 실행
     # run_dash_app(df_temp)
@@ -511,145 +750,256 @@ import numpy as np                     # 수학/통계 계산용
 import json                            # JSON 데이터 처리용
 import webbrowser                      # 브라우저 제어용
 import os                              # 파일 경로 처리용
+import string                          # HTML 템플릿 치환용 (string.Template)
+import gzip                            # HTML 압축본(.html.gz) 생성용
 
 
 # CSV 파일 경로 설정
 # 주의: 파일이 현재 폴더에 있어야 합니다!
 file_path = 'D:/생성 AI 응용 서비스 개발자 양성 과정/AI STUDY/github/kr_regional_daily_excel.csv'
 
-# pd.read_csv(): CSV 파일을 DataFrame(표)으로 읽어오기
-# encoding='utf-8-sig': 한글 깨짐 방지
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-
-df['date'] = pd.to_datetime(df['date'], format='%Y%m%d')
-df['date1'] = df['date'].dt.strftime('%Y-%m-%d')
-
-print("✓ 날짜 형식 변환 완료: YYYYMMDD → YYYY-MM-DD")
-
-
-df['region1'] = df['region'].str.capitalize()
-
-# Quarantine(격리시설) 데이터 제거
-# 비교 연산자 !=: '같지 않다'
-original_count = len(df)
-df = df[df['region1'] != 'Quarantine'].copy()
-removed_count = original_count - len(df)
-
-print(f"✓ 지역명 첫 글자 대문자 처리 완료")
-print(f"✓ Quarantine 데이터 제거: {removed_count:,}행")
-
-
-print("\n[3단계] 누락된 날짜 데이터 보정...")
-
-# 데이터 정렬: 지역별, 날짜별로 정렬
-# sort_values(): DataFrame 정렬 함수
-df = df.sort_values(['region1', 'date']).reset_index(drop=True)
-
-# 전체 날짜 범위 생성
-# min(): 최소값, max(): 최대값
-min_date = df['date'].min()
-max_date = df['date'].max()
-
-# pd.date_range(): 시작일부터 종료일까지 모든 날짜 생성
-# freq='D': 일(Day) 단위
-date_range = pd.date_range(start=min_date, end=max_date, freq='D')
-
-# 각 지역별로 누락된 날짜 채우기
-regions = df['region1'].unique()  # unique(): 중복 제거
-filled_data = []  # 빈 리스트 생성 (채워진 데이터 저장용)
-
-# for 반복문: 각 지역마다 아래 작업 반복
-for region in regions:
-    # 특정 지역 데이터만 필터링
-    region_df = df[df['region1'] == region].copy()
-    
-    # 전체 날짜 범위로 DataFrame 생성
-    complete_dates = pd.DataFrame({'date': date_range})
-    complete_dates['region1'] = region
-    
-    # merge(): 두 표를 합치기 (SQL의 JOIN과 유사)
-    # how='left': 왼쪽(complete_dates)의 모든 행 유지
-    merged = complete_dates.merge(region_df, on=['date', 'region1'], how='left')
-    
-    # ffill(): Forward Fill - 빈 값을 이전 값으로 채우기
-    # fillna(0): 여전히 빈 값이면 0으로 채우기
-    merged['confirmed'] = merged['confirmed'].ffill().fillna(0)
-    merged['death'] = merged['death'].ffill().fillna(0)
-    merged['released'] = merged['released'].ffill().fillna(0)
-    merged['date1'] = merged['date'].dt.strftime('%Y-%m-%d')
-    
-    # 리스트에 추가
-    filled_data.append(merged)
-
-# pd.concat(): 여러 DataFrame을 하나로 합치기
-# ignore_index=True: 인덱스 번호를 새로 매기기
-df = pd.concat(filled_data, ignore_index=True)
-
-print(f"✓ 누락 날짜 보정 완료: {len(df):,}행")
-
-print("\n[4단계] 누적 데이터를 일별 증감으로 변환...")
-
-# groupby(): 그룹별로 묶기 (여기서는 지역별)
-# diff(): 현재 행 - 이전 행 계산 (차분)
-# fillna(): 첫 행은 이전 행이 없으므로 원본 값 사용
-# clip(lower=0): 음수 값을 0으로 제한 (데이터 오류 방지)
-# astype(int): 정수형으로 변환
-
-df['confirm1'] = df.groupby('region1')['confirmed'].diff().fillna(df['confirmed']).clip(lower=0).astype(int)
-df['death1'] = df.groupby('region1')['death'].diff().fillna(df['death']).clip(lower=0).astype(int)
-df['released1'] = df.groupby('region1')['released'].diff().fillna(df['released']).clip(lower=0).astype(int)
-
-
+# CSV 파일을 DataFrame(표)으로 읽어오기
+# - pyarrow가 있으면 pyarrow.csv로 직접 읽음: 멀티스레드 파서 + 컬럼 타입 지정(타입 추론 생략)
+#   date는 읽는 동안 YYYYMMDD → 날짜로 바로 변환 → pandas에서 다시 파싱하지 않음
+#   (UTF-8 BOM은 pyarrow가 알아서 건너뜀)
+# - pyarrow가 없으면 pd.read_csv(C 파서) + 정수 YYYYMMDD를 연/월/일로 나눠서 날짜 조립
+# 누적 인원은 int32로 충분 (메모리 절약)
+count_dtypes = {'confirmed': 'int32', 'death': 'int32', 'released': 'int32'}
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+
+# 전처리 결과(Parquet) 경로
+# - 이 파일이 원본 CSV보다 새로우면 CSV가 바뀌지 않은 것 → 전처리(1~4단계)를 건너뛰고 바로 읽음
+# - 원본 CSV가 없으면(캐시만 있는 경우) 캐시를 그대로 읽음
+# - 경로는 원본 CSV와 같은 폴더 기준
+data_dir = os.path.dirname(file_path)
+cache_path = os.path.join(data_dir, 'kr_covid_temp.parquet')
+use_cache = (
+    pa is not None
+    and os.path.exists(cache_path)
+    and (not os.path.exists(file_path)
+         or os.path.getmtime(cache_path) >= os.path.getmtime(file_path))
+)
 
-# 필요한 컬럼만 선택
-output_df = df[['date1', 'region1', 'confirm1', 'death1', 'released1']].copy()
 
-# to_csv(): DataFrame을 CSV 파일로 저장
-# index=False: 인덱스 번호는 저장하지 않음
-output_df.to_csv('D:/생성 AI 응용 서비스 개발자 양성 과정/AI STUDY/github/kr_covid_temp.txt', index=False)
+# [4단계]에서 사용: 누적 -> 일별 증감
+# 데이터가 지역별, 날짜별로 정렬되어 있으므로 groupby 없이 NumPy 배열 한 번으로 계산
+# - 현재 행 - 이전 행 계산 (차분)
+# - 지역이 바뀌는 첫 행(starts: 지역별 첫 행 위치)은 이전 행이 없으므로 원본 값 사용
+# - 음수 값을 0으로 제한 (데이터 오류 방지)
+def grouped_diff(vals, starts):
+    out = np.empty_like(vals)
+    np.subtract(vals[1:], vals[:-1], out=out[1:])
+    out[starts] = vals[starts]
+    np.clip(out, 0, None, out=out)
+    return out
 
 
-# 방금 저장한 파일을 다시 읽어오기
-data = pd.read_csv('D:/생성 AI 응용 서비스 개발자 양성 과정/AI STUDY/github/kr_covid_temp.txt')
+if use_cache:
+    # Parquet에는 dtype(범주형 region1, int32 인원 수)이 그대로 저장되어 있음
+    data = pd.read_parquet(cache_path)
+    print(f"✓ 전처리 캐시에서 불러옴: {cache_path} ({len(data):,}행)")
+else:
+    if pa is not None:
+        table = pacsv.read_csv(
+            file_path,
+            convert_options=pacsv.ConvertOptions(
+                column_types={
+                    'date': pa.timestamp('ns'),
+                    'region': pa.dictionary(pa.int32(), pa.string()),
+                    **count_dtypes,
+                },
+                timestamp_parsers=['%Y%m%d'],
+            ),
+        )
+        # region은 사전(dictionary) 타입으로 읽음 → 문자열 컬럼을 만들지 않고 바로 범주형으로 변환됨
+        # self_destruct=True: 변환하면서 Arrow 메모리를 바로 해제 (최대 메모리 사용량 감소)
+        df = table.to_pandas(self_destruct=True)
+        del table
+    else:
+        # encoding='utf-8-sig': 한글 깨짐 방지
+        df = pd.read_csv(file_path, encoding='utf-8-sig', dtype={'date': 'int64', 'region': 'category', **count_dtypes})
+        # date는 정수 YYYYMMDD → 문자열 파싱 대신 나눗셈/나머지로 연/월/일을 한 번에 꺼내서 날짜로 조립
+        year, month_day = np.divmod(df['date'].to_numpy(), 10000)
+        month, day = np.divmod(month_day, 100)
+        df['date'] = pd.to_datetime({'year': year, 'month': month, 'day': day})
+    # (YYYY-MM-DD 문자열은 누락 날짜 보정 후 한 번만 생성)
+
+    print("✓ 날짜 형식 변환 완료: YYYYMMDD → YYYY-MM-DD")
+
+
+    # 지역명 종류는 18개뿐 → region은 읽을 때부터 범주형, 종류별로 한 번씩만 capitalize
+    # Quarantine(격리시설)은 대응표에서 빼 둠 → map 한 번으로 대문자 처리와 Quarantine 표시(NaN)를 같이 처리
+    # (행마다 문자열 함수/문자열 비교를 하지 않음, 이후 비교/정렬/groupby도 정수 코드로 처리)
+    capmap = {c: c.capitalize() for c in df['region'].cat.categories}
+    capmap = {c: cap for c, cap in capmap.items() if cap != 'Quarantine'}
+    region1 = df['region'].map(capmap)
+
+    # Quarantine(격리시설) 데이터 제거
+    # notna(): 대응표에 없는(Quarantine) 행은 NaN → 정수 코드 -1 하나와 비교
+    # 범주 목록은 이름순으로 고정 (파일에 나온 순서와 관계없이 지역 순서가 항상 같도록)
+    # 걸러낸 행에 region1을 assign으로 붙여서 반환 → 전체 프레임을 .copy()로 한 번 더 복사하지 않음
+    original_count = len(df)
+    keep = region1.notna()
+    df = df[keep].assign(region1=region1[keep].astype(pd.CategoricalDtype(sorted(set(capmap.values())))))
+    removed_count = original_count - len(df)
+
+    print(f"✓ 지역명 첫 글자 대문자 처리 완료")
+    print(f"✓ Quarantine 데이터 제거: {removed_count:,}행")
+
+
+    print("\n[3단계] 누락된 날짜 데이터 보정...")
+
+    # 전체 날짜 범위 생성
+    # min(): 최소값, max(): 최대값
+    min_date = df['date'].min()
+    max_date = df['date'].max()
+
+    # pd.date_range(): 시작일부터 종료일까지 모든 날짜 생성
+    # freq='D': 일(Day) 단위
+    date_range = pd.date_range(start=min_date, end=max_date, freq='D')
+
+    # 각 지역별로 누락된 날짜 채우기
+    # (지역 x 전체 날짜) 크기의 배열을 한 번 만들고, 원본 행을 '지역코드 x 날짜수 + 날짜 위치' 자리에 바로 넣음
+    # → MultiIndex 생성/reindex(해시 조인) 없이 위치 계산만으로 (지역, 날짜) 순서의 전체 표가 만들어짐
+    # (전체 행을 지역/날짜로 정렬할 필요도 없음)
+    region_dtype = df['region1'].dtype
+    n_regions, n_dates = len(region_dtype.categories), len(date_range)
+    n_rows = n_regions * n_dates
+    pos = df['region1'].cat.codes.to_numpy().astype(np.int64) * n_dates + (df['date'] - min_date).dt.days.to_numpy()
+
+    # 원본에 없는 (지역, 날짜) 자리는 0, 있는 자리만 표시
+    cum_cols = ['confirmed', 'death', 'released']
+    vals = np.zeros((n_rows, len(cum_cols)), dtype='int32')
+    vals[pos] = df[cum_cols].to_numpy()
+    has_row = np.zeros(n_rows, dtype=bool)
+    has_row[pos] = True
+
+    # Forward Fill - 빈 값을 이전 값으로 채우기 (지역 경계를 넘지 않도록)
+    # - 각 행이 '마지막으로 값이 있던 행 위치'를 가리키도록 누적 최대값(maximum.accumulate)으로 전파
+    # - 지역 첫 행은 자기 자신을 가리키게 해서 이전 지역 값이 넘어오지 않음 (첫 날짜가 비어 있으면 0)
+    last = np.where(has_row, np.arange(n_rows), 0)
+    last[::n_dates] = np.arange(0, n_rows, n_dates)
+    np.maximum.accumulate(last, out=last)
+    vals = vals[last]
+
+    # 'YYYY-MM-DD' 문자열은 전체 날짜(date_range)에 대해 한 번만 만들고 지역 수만큼 반복
+    # (datetime64[D]로 바꾼 뒤 문자열 변환 → NumPy가 한 번에 처리)
+    date_str = date_range.to_numpy().astype('datetime64[D]').astype(str)
+    df = pd.DataFrame({
+        'region1': pd.Categorical.from_codes(np.repeat(np.arange(n_regions), n_dates), dtype=region_dtype),
+        'date': np.tile(date_range.to_numpy(), n_regions),
+        **{c: vals[:, k] for k, c in enumerate(cum_cols)},
+        'date1': np.tile(date_str, n_regions),
+    })
+
+    print(f"✓ 누락 날짜 보정 완료: {len(df):,}행")
+
+    print("\n[4단계] 누적 데이터를 일별 증감으로 변환...")
+
+    # 3단계에서 모든 지역이 같은 날짜 수(n_dates)만큼 행을 가짐
+    # → 지역 첫 행 위치는 n_dates 간격으로 정해져 있으므로 지역 코드를 비교해서 경계를 찾을 필요 없음
+    # 결과도 int32 그대로 유지
+    starts = np.arange(0, n_rows, n_dates)
+    df[['confirm1', 'death1', 'released1']] = grouped_diff(vals, starts)
+
+
+
+    # 필요한 컬럼만 선택
+    # - 이후로는 읽기만 하므로 .copy()로 전체를 복사하지 않음
+    output_df = df[['date1', 'region1', 'confirm1', 'death1', 'released1']]
+
+    # 전처리 결과 저장
+    # - pyarrow가 있으면 Parquet(컬럼형, zstd 압축)으로 저장: 문자열로 바꿔 쓰지 않고 dtype 그대로 저장,
+    #   범주형 region1은 사전(dictionary) 인코딩 → CSV보다 파일이 훨씬 작고 다시 읽기도 빠름
+    # - pyarrow가 없으면 기존처럼 CSV(텍스트)로 저장
+    # index=False: 인덱스 번호는 저장하지 않음
+    if pa is not None:
+        output_df.to_parquet(cache_path, compression='zstd', index=False)
+    else:
+        output_df.to_csv(os.path.join(data_dir, 'kr_covid_temp.txt'), index=False)
+    print(f"✓ 파일 저장 완료: {len(output_df):,}행")
+
+    # 저장한 파일을 다시 읽지 않고 메모리의 DataFrame을 그대로 사용 (dtype 유지)
+    data = output_df
+
+# 통계/정보 박스용 값은 한 번만 계산해서 재사용
+# - 합계: 세 컬럼을 한 번의 sum()으로
+# - 지역 목록/수: region1은 범주형이므로 범주 목록을 그대로 사용 (전체 행을 다시 훑지 않음)
+count_cols = ['confirm1', 'death1', 'released1']
+totals = data[count_cols].sum()
+region_names = list(data['region1'].cat.categories)
 
-print(f"✓ 파일 읽기 완료: {len(data):,}행")
 print(f"\n📊 데이터 통계:")
 print(f"  - 기간: {data['date1'].min()} ~ {data['date1'].max()}")
-print(f"  - 지역 수: {data['region1'].nunique()}개")
-print(f"  - 지역 목록: {', '.join(sorted(data['region1'].unique()))}")
-print(f"  - 총 확진자: {data['confirm1'].sum():,}명")
-print(f"  - 총 사망자: {data['death1'].sum():,}명")
-print(f"  - 총 완치자: {data['released1'].sum():,}명")
+print(f"  - 지역 수: {len(region_names)}개")
+print(f"  - 지역 목록: {', '.join(sorted(region_names))}")
+print(f"  - 총 확진자: {totals['confirm1']:,}명")
+print(f"  - 총 사망자: {totals['death1']:,}명")
+print(f"  - 총 완치자: {totals['released1']:,}명")
 
 print("\n[7단계] 인터랙티브 Bubble Chart 생성...")
 
-data_json = data.to_dict('records')
-
-
-region_colors = {
-    'Seoul': '#EF4444',      # 빨강
-    'Busan': '#F59E0B',      # 주황
-    'Daegu': '#10B981',      # 초록
-    'Incheon': '#3B82F6',    # 파랑
-    'Gwangju': '#8B5CF6',    # 보라
-    'Daejeon': '#EC4899',    # 핑크
-    'Ulsan': '#14B8A6',      # 청록
-    'Sejong': '#F97316',     # 진한 주황
-    'Gyeonggi': '#6366F1',   # 인디고
-    'Gangwon': '#84CC16',    # 라임
-    'Chungbuk': '#06B6D4',   # 사이안
-    'Chungnam': '#A855F7',   # 보라2
-    'Jeonbuk': '#EAB308',    # 노랑
-    'Jeonnam': '#22C55E',    # 밝은 초록
-    'Gyeongbuk': '#0EA5E9',  # 하늘색
-    'Gyeongnam': '#D946EF',  # 마젠타
-    'Jeju': '#64748B'        # 슬레이트
-}
 
 date_min = data['date1'].min()
 date_max = data['date1'].max()
 
+# 기간별 집계를 Python(pandas)에서 한 번만 계산 → 브라우저는 선택한 기간의 배열만 사용
+# - 주간: 일요일 시작 주 / 월간: 매월 1일 / 분기: 1·4·7·10월 1일 기준
+# - 모든 지역이 같은 날짜를 공유 → 기간 시작일은 고유 날짜(지역 수만큼 적은 개수)에 대해서만 계산하고
+#   factorize 코드로 각 행에 펼침 (전체 행마다 날짜 파싱/기간 변환을 하지 않음)
+date_codes, unique_dates = pd.factorize(data['date1'])
+dates = pd.DatetimeIndex(unique_dates.to_numpy().astype('datetime64[D]'))
+period_starts = {
+    'weekly': dates - pd.to_timedelta((dates.dayofweek + 1) % 7, unit='D'),
+    'monthly': dates.to_period('M').start_time,
+    'quarterly': dates.to_period('Q').start_time,
+}
+# - 행이 (지역, 날짜) 순으로 정렬되어 있으므로 같은 (지역, 기간 시작일) 행은 항상 연속으로 붙어 있음
+#   → groupby로 키를 기간마다 다시 해시하지 않고, 이미 들고 있는 지역 코드와 기간 시작일이
+#     바뀌는 위치(구간 첫 행)만 찾아서 np.add.reduceat으로 구간 합계를 한 번에 계산
+region_codes = data['region1'].cat.codes.to_numpy()
+region_change = np.r_[True, region_codes[1:] != region_codes[:-1]]
+counts = data[count_cols].to_numpy()
+period_data = {'daily': data}
+for period, starts in period_starts.items():
+    start = starts.to_numpy().astype('datetime64[D]')[date_codes]
+    first = np.flatnonzero(region_change | np.r_[True, start[1:] != start[:-1]])
+    period_data[period] = pd.DataFrame({
+        'date1': start[first].astype(str),
+        'region1': data['region1'].array[first],
+        **{c: np.add.reduceat(counts[:, k], first) for k, c in enumerate(count_cols)},
+    })
+
+# 세 지표가 모두 0인 행은 어떤 지표를 골라도 그려지지 않으므로(JS는 값 > 0인 점만 표시) 미리 제거
+# → 0인 날짜는 데이터에 없으면 0으로 간주, 지역별 첫 행만은 남겨서 지역 목록이 비지 않도록
+# - 지역별 행이 연속으로 모여 있으므로 첫 행 = 범주 코드가 바뀌는 위치 (해시 기반 duplicated() 불필요)
+for period, period_df in period_data.items():
+    keep = (period_df[count_cols].to_numpy() != 0).any(axis=1)
+    region_codes = period_df['region1'].cat.codes.to_numpy()
+    keep[0] = True
+    keep[1:] |= region_codes[1:] != region_codes[:-1]
+    period_data[period] = period_df[keep]
+
+# 버블 크기 스케일용: (기간, 지역)별 지표 최댓값을 미리 계산해서 함께 전달
+# - 버블 크기는 선택된 region1의 min/max로 정하므로 브라우저에서 "확인"을 누를 때마다 다시 계산해야 함
+#   → 전체 행을 다시 훑지 않고 선택된 지역의 최댓값만 비교 (지역 수만큼)
+# - 형태: {기간: {region1: [확진자, 사망자, 완치자]}}
+region_max = {
+    period: {
+        region: values
+        for region, values in zip(
+            period_df['region1'].unique(),
+            period_df.groupby('region1', observed=True, sort=False)[count_cols].max().to_numpy().tolist(),
+        )
+    }
+    for period, period_df in period_data.items()
+}
+
 print("✓ 차트 데이터 준비 완료")
 print(f"  - 날짜 범위: {date_min} ~ {date_max}")
 print(f"  - 전체 데이터 포인트: {len(data):,}개")
@@ -657,7 +1007,7 @@ print(f"  - 전체 데이터 포인트: {len(data):,}개")
 # HTML/CSS/JavaScript를 포함한 완전한 웹 페이지 생성
 # 이 방식을 사용하면 Plotly 라이브러리 설치 없이도 차트 생성 가능
 
-html_template = '''<!DOCTYPE html>
+html_template = string.Template('''<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
@@ -665,7 +1015,10 @@ html_template = '''<!DOCTYPE html>
     <title>대한민국 코로나19 Bubble Chart</title>
     
     <!-- Plotly.js 라이브러리 로드 (CDN 사용) -->
-    <script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
+    <!-- preconnect: CDN 연결(DNS/TLS)을 미리 열어 둠 -->
+    <!-- defer: 다운로드 중에도 페이지를 먼저 그리고, 문서 파싱이 끝난 뒤 실행 -->
+    <link rel="preconnect" href="https://cdn.plot.ly">
+    <script defer src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
     
     <style>
         /* ================================================================
@@ -685,6 +1038,19 @@ html_template = '''<!DOCTYPE html>
             height: 800px;
         }
         
+        /* 차트가 그려지기 전(비어 있는 동안) 보여줄 자리 표시(스켈레톤) */
+        #chart:empty {
+            border-radius: 8px;
+            background: linear-gradient(90deg, #F3F4F6 25%, #E5E7EB 50%, #F3F4F6 75%);
+            background-size: 200% 100%;
+            animation: chart-skeleton 1.2s ease-in-out infinite;
+        }
+        
+        @keyframes chart-skeleton {
+            from { background-position: 200% 0; }
+            to { background-position: -200% 0; }
+        }
+        
         /* 정보 박스 */
         .info {
             margin-bottom: 15px;
@@ -815,11 +1181,11 @@ html_template = '''<!DOCTYPE html>
     <!-- 데이터 정보 표시 -->
     <div class="info">
         <strong>📊 대한민국 코로나19 데이터 분석</strong><br>
-        기간: {date_min} ~ {date_max} | 
-        지역(region1): {region_count}개 | 
-        총 확진자: {total_confirm:,}명 | 
-        총 사망자: {total_death:,}명 | 
-        총 완치자: {total_released:,}명
+        기간: $date_min ~ $date_max | 
+        지역(region1): $region_count개 | 
+        총 확진자: $total_confirm명 | 
+        총 사망자: $total_death명 | 
+        총 완치자: $total_released명
     </div>
     
     <!--  드롭다운 메뉴 1: 확진자/사망자/완치자 선택 -->
@@ -865,6 +1231,10 @@ html_template = '''<!DOCTYPE html>
     <!-- Plotly 차트가 렌더링될 컨테이너 -->
     <div id="chart"></div>
 
+    <!-- 기간별 데이터: JS 코드가 아닌 JSON 텍스트로 넣어 두고 JSON.parse로 읽음
+         (큰 객체 리터럴을 JS 파서로 해석하는 것보다 JSON 파서가 훨씬 빠름) -->
+    <script type="application/json" id="periodData">$period_json</script>
+
     <script>
         /*
          * ====================================================================
@@ -874,131 +1244,130 @@ html_template = '''<!DOCTYPE html>
          */
         
         // Python에서 전달받은 데이터 (JSON 형식)
-        const rawData = {data_json};
+        // 기간별(일별/주간/월간/분기)로 Python에서 미리 집계해 둔 배열
+        // (세 지표가 모두 0인 날짜는 빠져 있음 → 없는 날짜는 0으로 간주)
+        // 열 이름은 기간마다 한 번만 전달됨({columns, data}) → 행 배열을 {열 이름: 값} 객체로 복원
+        const periodData = {};
+        for (const [period, table] of Object.entries(JSON.parse(document.getElementById('periodData').textContent))) {
+            const columns = table.columns;
+            periodData[period] = table.data.map(row => {
+                const d = {};
+                for (let i = 0; i < columns.length; i++) d[columns[i]] = row[i];
+                return d;
+            });
+        }
+        const rawData = periodData.daily;
+
+        // 날짜 문자열('YYYY-MM-DD') → 숫자(ms, UTC 자정)는 페이지 로드 시 한 번만 변환
+        // → 다시 그릴 때마다 Plotly가 날짜 문자열을 파싱하지 않음
+        for (const rows of Object.values(periodData)) {
+            for (const d of rows) d.t = Date.parse(d.date1);
+        }
         
         // 6-(7) region1별 색상 정의
-        const regionColors = {region_colors_json}; //여기수정
+        // 고정된 17개 색상 → Python에서 json.dumps로 매번 만들지 않고 HTML 템플릿에 그대로 적어 둠
+        const regionColors = {
+            'Seoul': '#EF4444',      // 빨강
+            'Busan': '#F59E0B',      // 주황
+            'Daegu': '#10B981',      // 초록
+            'Incheon': '#3B82F6',    // 파랑
+            'Gwangju': '#8B5CF6',    // 보라
+            'Daejeon': '#EC4899',    // 핑크
+            'Ulsan': '#14B8A6',      // 청록
+            'Sejong': '#F97316',     // 진한 주황
+            'Gyeonggi': '#6366F1',   // 인디고
+            'Gangwon': '#84CC16',    // 라임
+            'Chungbuk': '#06B6D4',   // 사이안
+            'Chungnam': '#A855F7',   // 보라2
+            'Jeonbuk': '#EAB308',    // 노랑
+            'Jeonnam': '#22C55E',    // 밝은 초록
+            'Gyeongbuk': '#0EA5E9',  // 하늘색
+            'Gyeongnam': '#D946EF',  // 마젠타
+            'Jeju': '#64748B'        // 슬레이트
+        };
+
+        // 기간 → region1 → [확진자, 사망자, 완치자] 최댓값 (버블 크기 스케일용, Python에서 미리 계산)
+        const regionMax = $region_max_json;
+
+        // 메트릭 → regionMax 배열 위치
+        const metricIndex = {'confirm1': 0, 'death1': 1, 'released1': 2};
 
         // 메트릭 이름 매핑 (confirm1 → 확진자)
-        const metricNames = {{
+        const metricNames = {
             'confirm1': '확진자',
             'death1': '사망자',
             'released1': '완치자'
-        }};
+        };
         
         /**
          * ================================================================
-         * 기간별 데이터 집계 함수
+         * 기간별 데이터 조회 함수
          * ================================================================
          * 
-         * @param {{Array}} data - 원본 데이터 배열
-         * @param {{string}} period - 집계 기간 (daily/weekly/monthly/quarterly)
-         * @returns {{Array}} 집계된 데이터 배열
+         * @param {string} period - 집계 기간 (daily/weekly/monthly/quarterly)
+         * @returns {Array} 집계된 데이터 배열
          * 
-         * 역할: 일별 데이터를 주간/월간/분기별로 합산
+         * 역할: Python에서 미리 합산해 둔 주간/월간/분기 데이터를 꺼내기
+         *       (클릭할 때마다 브라우저에서 다시 집계하지 않음)
          */
-        function aggregateData(data, period) {{
-            // 일별은 집계하지 않고 그대로 반환
-            if (period === 'daily') {{
-                return data;
-            }}
-            
-            // 집계 결과를 저장할 객체
-            // 키(key): "지역_날짜", 값(value): 집계된 데이터
-            const aggregated = {{}};
-            
-            // 각 데이터 행을 순회하며 집계
-            data.forEach(row => {{
-                const date = new Date(row.date1);
-                let key;  // 집계 키를 저장할 변수
-                
-                if (period === 'weekly') {{
-                    // 주간 집계: 일요일을 기준으로 주의 시작일 계산
-                    const dayOfWeek = date.getDay();  // 0(일) ~ 6(토)
-                    const weekStart = new Date(date);
-                    weekStart.setDate(date.getDate() - dayOfWeek);
-                    const weekKey = weekStart.toISOString().split('T')[0];
-                    key = `${{row.region1}}_${{weekKey}}`;
-                }} else if (period === 'monthly') {{
-                    // 월간 집계: 매월 1일 기준
-                    const monthKey = `${{date.getFullYear()}}-${{String(date.getMonth() + 1).padStart(2, '0')}}-01`;
-                    key = `${{row.region1}}_${{monthKey}}`;
-                }} else if (period === 'quarterly') {{
-                    // 분기별 집계: Q1(1월), Q2(4월), Q3(7월), Q4(10월)
-                    const year = date.getFullYear();
-                    const month = date.getMonth();  // 0~11
-                    const quarter = Math.floor(month / 3);  // 0,1,2,3
-                    const quarterMonth = (quarter * 3) + 1;  // 1,4,7,10
-                    const quarterKey = `${{year}}-${{String(quarterMonth).padStart(2, '0')}}-01`;
-                    key = `${{row.region1}}_${{quarterKey}}`;
-                }}
-                
-                // 키가 처음 등장하면 새로운 집계 데이터 생성
-                if (!aggregated[key]) {{
-                    aggregated[key] = {{
-                        date1: key.split('_')[1],
-                        region1: row.region1,
-                        confirm1: 0,
-                        death1: 0,
-                        released1: 0
-                    }};
-                }}
-                
-                // 값 누적 (같은 기간의 데이터를 합산)
-                aggregated[key].confirm1 += row.confirm1 || 0;
-                aggregated[key].death1 += row.death1 || 0;
-                aggregated[key].released1 += row.released1 || 0;
-            }});
-            
-            // 객체를 배열로 변환하여 반환
-            return Object.values(aggregated);
-        }}
+        function aggregateData(period) {
+            return periodData[period];
+        }
         
         /**
          * ================================================================
          * Plotly 트레이스 생성 함수
          * ================================================================
          * 
-         * @param {{Array}} data - 데이터 배열
-         * @param {{string}} metric - 메트릭 ('confirm1', 'death1', 'released1')
-         * @param {{Array}} selectedRegions - 선택된 region1 배열
-         * @returns {{Array}} Plotly 트레이스 배열
+         * @param {Array} data - 데이터 배열
+         * @param {string} metric - 메트릭 ('confirm1', 'death1', 'released1')
+         * @param {Array} selectedRegions - 선택된 region1 배열
+         * @param {Object} maxByRegion - region1별 지표 최댓값 (regionMax[기간])
+         * @returns {Array} Plotly 트레이스 배열
          * 
          * 역할: region1별로 버블 차트 데이터 생성
          */
-        function createTraces(data, metric, selectedRegions) {{
+        function createTraces(data, metric, selectedRegions, maxByRegion) {
+            // 데이터를 한 번만 훑어서 region1별 행 목록 만들기
+            // (region1마다 전체 데이터를 다시 filter하지 않음)
+            // 값이 0인 데이터는 표시하지 않음
+            const byRegion = new Map();
+            for (const d of data) {
+                if (!(d[metric] > 0)) continue;
+                let rows = byRegion.get(d.region1);
+                if (!rows) byRegion.set(d.region1, rows = []);
+                rows.push(d);
+            }
+
             // 6-(6) 선택된 region1만 사용
             // 선택된 것이 없으면 전체 region1 사용
             const regions = selectedRegions.length > 0 
                 ? selectedRegions 
-                : [...new Set(data.map(d => d.region1))].sort();
-           
-            const globalData = data.filter(d =>
-                regions.includes(d.region1) && d[metric] > 0
-            );
-            const globalValues = globalData.map(d => d[metric]);
-            const globalMaxValue = Math.max(...globalValues, 1);
-            const globalMinValue = Math.min(...globalValues.filter(v => v > 0), 1);
-
-            return regions.map(region => {{
-                // Y축: 특정 region1 데이터만 필터링
-                const regionData = data.filter(d => d.region1 === region);
-                
-                // 값이 0인 데이터는 표시하지 않음
-                const filteredData = regionData.filter(d => d[metric] > 0);
+                : [...byRegion.keys()].sort();
+
+            // 선택된 region1 전체의 min/max (버블 크기 스케일 기준)
+            // - 최댓값: 미리 계산해 둔 region1별 최댓값만 비교 (전체 행을 다시 훑지 않음)
+            // - 최솟값: 값은 정수(명)이고 0보다 큰 값만 그리므로 Math.min(...값, 1)은 항상 1
+            const k = metricIndex[metric];
+            const globalMaxValue = Math.max(...regions.map(r => maxByRegion[r] ? maxByRegion[r][k] : 0), 1);
+            const globalMinValue = 1;
+
+            return regions.map(region => {
+                // Y축: 특정 region1 데이터만 (값 > 0)
+                const filteredData = byRegion.get(region) || [];
                 
                 // 데이터가 없으면 null 반환 (나중에 제거됨)
-                if (filteredData.length === 0) {{
+                if (filteredData.length === 0) {
                     return null;
-                }}
+                }
                 
   
-                //버블 크기 최적화(전역 스케일): region 무관하게 global min/max 사용
+                //버블 크기 최적화(전역 스케일): 선택된 region1 전체의 global min/max 사용
                 const values = filteredData.map(d => d[metric]);
 
                 //sqrt 스케일 적용
                 // sqrt를 사용하는 이유: 버블의 면적이 값에 비례하도록 함
-                const sizes = values.map(value => {{
+                const sizes = values.map(value => {
                     // 정규화: 0~1 범위로 변환
  
                     const normalizedValue = (value - globalMinValue) / (globalMaxValue - globalMinValue || 1);
@@ -1007,12 +1376,12 @@ html_template = '''<!DOCTYPE html>
                     const sqrtScale = Math.sqrt(normalizedValue);
                     // 크기 범위: 10~50 (버블이 너무 작거나 크지 않도록)
                     return 10 + (sqrtScale * 40);
-                }});
+                });
                 
                 // Plotly Scatter 트레이스 객체 생성
-                return {{
+                return {
                     // X축: 날짜 (date1)
-                    x: filteredData.map(d => d.date1),
+                    x: filteredData.map(d => d.t),
                     
                     // Y축: 지역 (region1)
                     y: filteredData.map(d => d.region1),
@@ -1023,16 +1392,16 @@ html_template = '''<!DOCTYPE html>
                     name: region,
                     
                     // 버블 스타일 정의
-                    marker: {{
+                    marker: {
                         size: sizes,  // 계산된 버블 크기 배열
                         // region1별로 각각 지정된 색상
                         color: regionColors[region] || '#94A3B8',
                         opacity: 0.7,  // 투명도 70%
-                        line: {{
+                        line: {
                             color: 'white',  // 버블 테두리 색상
                             width: 1  // 테두리 두께
-                        }}
-                    }},
+                        }
+                    },
                     
                     // customdata: 실제 값 저장 (sqrt 스케일 적용 전)
                     // hover에서 원본 값을 표시하기 위해 사용
@@ -1044,14 +1413,20 @@ html_template = '''<!DOCTYPE html>
                     
                     // Hover 템플릿: 마우스를 올렸을 때 표시될 내용
                     hovertemplate: 
-                        '%{{customdata[0]}}<br>' +  // X축: 날짜
-                        '%{{customdata[1]}}: %{{customdata[2]:,}}명<br>' +  // Y축: region1, 값
+                        '%{customdata[0]}<br>' +  // X축: 날짜
+                        '%{customdata[1]}: %{customdata[2]:,}명<br>' +  // Y축: region1, 값
                         '<extra></extra>',  // 추가 정보 숨김
                     
-                    type: 'scatter'  // 차트 타입
-                }};
-            }}).filter(trace => trace !== null);  // null 제거
-        }}
+                    // 차트 타입: scattergl = WebGL(GPU)로 그려서 점이 많아도 확대/이동이 빠름
+                    // (하단 rangeslider 미리보기는 SVG로 그려짐)
+                    type: 'scattergl'
+                };
+            }).filter(trace => trace !== null);  // null 제거
+        }
+        
+        // 트레이스 캐시: "메트릭|기간|region1목록" → 트레이스 배열 (최근 사용 32개까지)
+        const traceCache = new Map();
+        const TRACE_CACHE_SIZE = 32;
         
         /**
          * ================================================================
@@ -1061,7 +1436,10 @@ html_template = '''<!DOCTYPE html>
          * 역할: "확인" 버튼 클릭 시 실행되어 선택된 region1으로 차트 재생성
          *       Y축을 선택된 region1에 맞춰 영역 분할
          */
-        function updateChart() {{
+        function updateChart() {
+            // Plotly가 아직 로드되지 않았으면 건너뜀 (로드 후 초기 렌더링에서 현재 선택값으로 그림)
+            if (!window.Plotly) return;
+            
             // 현재 선택된 메트릭과 기간 가져오기
             const metric = document.getElementById('metricSelect').value;
             const period = document.getElementById('periodSelect').value;
@@ -1073,56 +1451,69 @@ html_template = '''<!DOCTYPE html>
             
             console.log('선택된 region1:', selectedRegions);  // 디버깅용
             
-            // 기간별 데이터 집계
-            const processedData = aggregateData(rawData, period);
-            
-            // 트레이스 생성 시 선택된 region1 전달
-            const traces = createTraces(processedData, metric, selectedRegions);
+            // 같은 (메트릭, 기간, 선택 region1) 조합이면 이전에 만든 트레이스 재사용
+            const cacheKey = `$${metric}|$${period}|$${[...selectedRegions].sort().join(',')}`;
+            let traces = traceCache.get(cacheKey);
+            if (traces) {
+                // 최근 사용 순서 갱신 (Map은 삽입 순서를 유지)
+                traceCache.delete(cacheKey);
+            } else {
+                // 기간별 데이터 집계
+                const processedData = aggregateData(period);
+                
+                // 트레이스 생성 시 선택된 region1 전달
+                traces = createTraces(processedData, metric, selectedRegions, regionMax[period]);
+            }
+            traceCache.set(cacheKey, traces);
+            if (traceCache.size > TRACE_CACHE_SIZE) {
+                // 가장 오래 사용하지 않은 항목 제거
+                traceCache.delete(traceCache.keys().next().value);
+            }
             
             // ============================================================
             // Plotly 레이아웃 설정: 차트의 외형과 스타일 정의
             // ============================================================
-            const layout = {{
+            const layout = {
                 // 그래프 제목 (안쪽 배치)
-                title: {{
+                title: {
                     text: '대한민국 코로나19',
                     x: 0.5,          // 제목 위치 (0.5 = 중앙)
                     y: 0.95,         // 세로 위치 (0.95 = 상단)
                     xanchor: 'center',
                     yanchor: 'top',
-                    font: {{
+                    font: {
                         size: 24,
                         color: '#111827'
-                    }}
-                }},
+                    }
+                },
                 
                 // X축 설정
-                xaxis: {{
+                xaxis: {
                     title: '',
                     type: 'date',  // 날짜 타입
                     // 6-(10) X축 표시: 일자까지만 (시간 표시 제거)
                     tickformat: '%Y-%m-%d',
                     hoverformat: '%Y-%m-%d',
                     // 6-(16) X축 MIN/MAX 설정
-                    range: ['{date_min}', '{date_max}'],
+                    range: ['$date_min', '$date_max'],
                     // 6-(11) 격자선 색상
                     gridcolor: '#F3F4F6',
                     showgrid: true,
                     zeroline: false,
                     
                     // 6-(14) 슬라이더 추가
-                    rangeslider: {{
+                    rangeslider: {
                         visible: true,
                         // 6-(15) 슬라이더 배경: 하얀색
                         bgcolor: 'white',
                         thickness: 0.05,
                         bordercolor: '#d1d5db',
                         borderwidth: 1
-                    }}
-                }},
+                    }
+                },
                 
                 //Y축 설정
-                yaxis: {{
+                yaxis: {
                     title: '',
                     type: 'category',  // 카테고리 타입
                     // 6-(6) Y축을 선택된 region1에 맞춰 영역 분할
@@ -1137,7 +1528,7 @@ html_template = '''<!DOCTYPE html>
                     showgrid: true,
                     zeroline: false,
                     fixedrange: false
-                }},
+                },
                 
                 // 배경색 없음 (투명)
                 plot_bgcolor: 'rgba(0,0,0,0)',
@@ -1148,7 +1539,7 @@ html_template = '''<!DOCTYPE html>
                 
                 // 범례 설정
                 showlegend: true,
-                legend: {{
+                legend: {
                     orientation: 'v',  // 세로 방향
                     x: 1.02,  // 차트 오른쪽
                     y: 1,
@@ -1157,30 +1548,30 @@ html_template = '''<!DOCTYPE html>
                     bgcolor: 'rgba(255,255,255,0.9)',
                     bordercolor: '#E5E7EB',
                     borderwidth: 1,
-                    font: {{ size: 10 }}
-                }},
+                    font: { size: 10 }
+                },
                 
                 height: 800,
-                margin: {{ l: 80, r: 180, t: 100, b: 120 }}
-            }};
+                margin: { l: 80, r: 180, t: 100, b: 120 }
+            };
             
             // 모드바 설정 (확대/축소/저장 등 도구)
-            const config = {{
+            const config = {
                 displayModeBar: true,  // 모드바 표시
                 displaylogo: false,  // Plotly 로고 숨김
-                toImageButtonOptions: {{
+                toImageButtonOptions: {
                     format: 'png',
                     filename: 'korea_covid19',
                     height: 1000,
                     width: 1600,
                     scale: 2
-                }}
-            }};
+                }
+            };
             
             // Plotly 차트 렌더링
-            // newPlot: 새로운 차트 생성 또는 기존 차트 대체
-            Plotly.newPlot('chart', traces, layout, config);
-        }}
+            // react: 기존 차트와 비교해서 바뀐 부분만 다시 그림 (처음 호출 시에는 newPlot과 동일)
+            Plotly.react('chart', traces, layout, config);
+        }
         
         /**
          * ================================================================
@@ -1189,13 +1580,13 @@ html_template = '''<!DOCTYPE html>
          * 
          * 역할: 데이터에서 region1 목록을 가져와 체크박스 동적 생성
          */
-        function initializeRegionCheckboxes() {{
+        function initializeRegionCheckboxes() {
             // region1 목록 추출 (중복 제거 후 정렬)
             const regions = [...new Set(rawData.map(d => d.region1))].sort();
             const container = document.getElementById('regionCheckboxes');
             
             // 각 region1별로 체크박스 생성
-            regions.forEach(region => {{
+            regions.forEach(region => {
                 // div 엘리먼트 생성
                 const item = document.createElement('div');
                 item.className = 'checkbox-item';
@@ -1203,21 +1594,21 @@ html_template = '''<!DOCTYPE html>
                 // 체크박스 생성
                 const checkbox = document.createElement('input');
                 checkbox.type = 'checkbox';
-                checkbox.id = `region_${{region}}`;
+                checkbox.id = `region_$${region}`;
                 checkbox.value = region;
                 checkbox.checked = true;  // 기본적으로 모두 선택됨
                 
                 // 라벨 생성
                 const label = document.createElement('label');
-                label.htmlFor = `region_${{region}}`;
+                label.htmlFor = `region_$${region}`;
                 label.textContent = region;
                 
                 // 엘리먼트 조립
                 item.appendChild(checkbox);
                 item.appendChild(label);
                 container.appendChild(item);
-            }});
-        }}
+            });
+        }
         
         // ====================================================================
         // 페이지 로드 시 초기화 및 이벤트 리스너 등록
@@ -1226,88 +1617,101 @@ html_template = '''<!DOCTYPE html>
         // region1별 체크박스 생성
         initializeRegionCheckboxes();
         
-        // 초기 차트 렌더링
-        updateChart();
+        // 초기 차트 렌더링: defer로 불러온 Plotly가 실행된 뒤(DOMContentLoaded),
+        // 브라우저가 한가할 때 그림 → 정보 박스/컨트롤이 먼저 화면에 표시됨
+        document.addEventListener('DOMContentLoaded', () => {
+            if ('requestIdleCallback' in window) {
+                requestIdleCallback(() => updateChart());
+            } else {
+                setTimeout(updateChart, 0);
+            }
+        });
         
         // 드롭다운 메뉴 변경 시 자동 업데이트
         document.getElementById('metricSelect').addEventListener('change', updateChart);
         document.getElementById('periodSelect').addEventListener('change', updateChart);
         
         // 전체선택 버튼 클릭 이벤트
-        document.getElementById('selectAllBtn').addEventListener('click', () => {{
-            document.querySelectorAll('.checkbox-item input').forEach(cb => {{
+        document.getElementById('selectAllBtn').addEventListener('click', () => {
+            document.querySelectorAll('.checkbox-item input').forEach(cb => {
                 cb.checked = true;
-            }});
-        }});
+            });
+        });
         
         // 전체해제 버튼 클릭 이벤트
-        document.getElementById('deselectAllBtn').addEventListener('click', () => {{
-            document.querySelectorAll('.checkbox-item input').forEach(cb => {{
+        document.getElementById('deselectAllBtn').addEventListener('click', () => {
+            document.querySelectorAll('.checkbox-item input').forEach(cb => {
                 cb.checked = false;
-            }});
-        }});
+            });
+        });
         
         // "확인" 버튼 클릭 이벤트
         // Y축을 선택된 region1에 맞춰 영역 분할 및 Bubble 크기 최적화
-        document.getElementById('applyRegionBtn').addEventListener('click', () => {{
+        document.getElementById('applyRegionBtn').addEventListener('click', () => {
             updateChart();  // 차트 재생성
-        }});
+        });
     </script>
 </body>
-</html>'''
-##KeyError: '\n            font-family' --> 첫번째 컴파일에서 에러 이곳을 추가함---2차시도
-# ==========================================================
-# str.format() 중괄호 충돌 해결(자동 이스케이프)
-# - CSS/JS의 { } 는 format이 변수로 착각 → KeyError 발생
-# - 치환해야 하는 자리({date_min} 같은 것)만 "임시 토큰"으로 보호한 뒤
-#   나머지 { } 를 전부 {{ }} 로 바꿔줍니다.
-# ==========================================================
-
-placeholders = {
-    "{data_json}": "__DATA_JSON__",
-    "{region_colors_json}": "__REGION_COLORS__",
-    "{date_min}": "__DATE_MIN__",
-    "{date_max}": "__DATE_MAX__",
-    "{region_count}": "__REGION_COUNT__",
-    "{total_confirm:,}": "__TOTAL_CONFIRM__",
-    "{total_death:,}": "__TOTAL_DEATH__",
-    "{total_released:,}": "__TOTAL_RELEASED__",
+</html>''')
+
+# HTML 파일 생성 + 저장
+# string.Template: $이름 자리만 치환 → CSS/JS의 { } 는 그대로 두면 되므로 중괄호 이스케이프 불필요
+# (JS 템플릿 문자열의 ${...} 는 템플릿 안에서 $${...} 로 적어 둠)
+# 전체 HTML 문자열을 메모리에 만들지 않고, 치환 자리 사이의 조각과 값을 파일에 바로 씀
+template_values = {
+    'date_min': date_min,
+    'date_max': date_max,
+    'region_count': len(region_names),
+    'total_confirm': f"{int(totals['confirm1']):,}",
+    'total_death': f"{int(totals['death1']):,}",
+    'total_released': f"{int(totals['released1']):,}",
+    'region_max_json': json.dumps(region_max, separators=(',', ':')),
 }
 
-# 1) 치환할 자리만 토큰으로 잠시 보호
-for k, token in placeholders.items():
-    html_template = html_template.replace(k, token)
-
-# 2) 나머지 모든 중괄호를 format-safe하게 이스케이프
-html_template = html_template.replace("{", "{{").replace("}", "}}")
-
-# 3) 보호했던 토큰을 다시 원래 치환 자리로 복원
-for k, token in placeholders.items():
-    html_template = html_template.replace(token, k)
-#-------------------------------------------------------------------------2차시도
-# HTML 파일 생성
-html_content = html_template.format(
-    data_json=json.dumps(data_json),
-    region_colors_json=json.dumps(region_colors),
-    date_min=date_min,
-    date_max=date_max,
-    region_count=data['region1'].nunique(),
-    total_confirm=int(data['confirm1'].sum()),
-    total_death=int(data['death1'].sum()),
-    total_released=int(data['released1'].sum())
-)
+# 배포(정적 호스팅)용 gzip 압축본도 함께 저장
+# - 서버에서 Content-Encoding: gzip 으로 보내면 전송량이 크게 줄어듦
+# - 로컬(file://)에서 열 때는 압축하지 않은 .html 사용
+# - .html과 .html.gz에 같은 조각을 동시에 씀 → 다 쓴 .html을 다시 읽어서 압축하지 않음
+class TeeWriter:
+    def __init__(self, *files):
+        self.files = files
+
+    def write(self, text):
+        for file in self.files:
+            file.write(text)
 
-# ✅ [최소 수정] JS 문법 오류(Unexpected token '{') 해결:
-# 템플릿 내부에 남은 '{{' '}}'를 '{' '}'로 평탄화하여 자바스크립트 파싱 오류를 방지합니다.
-html_content = html_content.replace('{{', '{').replace('}}', '}')
 
-# HTML 파일 저장
 output_html = 'korea_covid19_interactive.html'
-with open(output_html, 'w', encoding='utf-8') as f:
-    f.write(html_content)
+output_html_gz = output_html + '.gz'
+template_text = html_template.template
+# buffering=1<<20: 1MiB 버퍼로 모아서 쓰기 (작은 write 호출 최소화)
+with open(output_html, 'w', encoding='utf-8', buffering=1 << 20) as html_file, \
+        gzip.open(output_html_gz, 'wt', encoding='utf-8', compresslevel=6) as gz_file:
+    f = TeeWriter(html_file, gz_file)
+    pos = 0
+    for m in html_template.pattern.finditer(template_text):
+        f.write(template_text[pos:m.start()])
+        name = m.group('named') or m.group('braced')
+        if name is None:
+            f.write('$')  # $$ → $
+        elif name == 'period_json':
+            # {"daily": {...}, "weekly": {...}, ...} 형태로 기간별 표를 차례로 씀
+            # to_json(): DataFrame을 바로 JSON으로 파일에 씀 (행마다 dict를 만들지 않음)
+            # orient='split', index=False: {"columns": [...], "data": [[...], ...]} 형태
+            # → 행마다 열 이름을 반복하지 않아 HTML 크기가 줄어듦 (행 객체는 브라우저에서 복원)
+            f.write('{')
+            for i, (period, period_df) in enumerate(period_data.items()):
+                f.write((',' if i else '') + json.dumps(period) + ':')
+                period_df.to_json(f, orient='split', index=False)
+            f.write('}')
+        else:
+            f.write(str(template_values[name]))
+        pos = m.end()
+    f.write(template_text[pos:])
 
 print("✓ HTML 파일 생성 완료!")
 print(f"  - 파일명: {output_html}")
+print(f"  - 압축본: {output_html_gz} ({os.path.getsize(output_html_gz):,} bytes)")
 
 # ==============================================================================
 # 브라우저에서 차트 표시
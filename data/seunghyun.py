@@ -4,7 +4,7 @@ import plotly.graph_objects as go
 
 
 # 한국 종합 데이터 로드
-df_total = pd.read_csv("data/kr_daily.csv") 
+df_total = pd.read_csv("data/kr_daily.csv", engine="pyarrow") 
 # 날짜 형식 변환 및 정렬
 df_total["date"] = pd.to_datetime(df_total["date"], format="%Y%m%d")
 df_total = df_total.sort_values("date").reset_index(drop=True)
@@ -13,28 +13,30 @@ df_total["critical"] = df_total["critical"].fillna(0) # 결측치 0으로 채우
 
 # 일별 증감 계산
 cols = ["confirmed", "death", "released", "tested", "negative", "critical"]
-new_cols = df_total[cols].diff() # 일별 차이는 new_를 붙혀서 새로운 컬럼으로 표현
-new_cols.columns = ["new_" + c for c in cols]
+vals = df_total[cols].to_numpy(dtype=np.float64)
+new_vals = np.empty_like(vals)
+new_vals[0] = 0 # 첫 행은 이전 날이 없으므로 0 (NaN을 만들었다가 다시 채우지 않음)
+np.subtract(vals[1:], vals[:-1], out=new_vals[1:]) # 일별 차이는 new_를 붙혀서 새로운 컬럼으로 표현
 
-df_total = pd.concat([df_total, new_cols], axis=1) # 기존데이터 프레임에 새로운 컬럼 추가
-df_total.fillna(0, inplace=True) # 첫 행 NaN 제거
+df_total = df_total.assign(**{"new_" + c: new_vals[:, i] for i, c in enumerate(cols)}) # 기존데이터 프레임에 새로운 컬럼 추가
 
 # 지역별 데이터 로드
-df = pd.read_csv("data/kr_regional_daily_excel.csv")
-# 날짜 형식 변환 및 정렬
-df["date"] = pd.to_datetime(df["date"], format="%Y%m%d")
+df = pd.read_csv("data/kr_regional_daily_excel.csv", engine="pyarrow")
+# 날짜 형식 변환 및 정렬 (cache=True: 지역 수만큼 반복되는 날짜는 한 번만 변환)
+df["date"] = pd.to_datetime(df["date"], format="%Y%m%d", cache=True)
 df = df.sort_values(["region", "date"]).reset_index(drop=True)
-# 지역별 신규확진자수
+# 지역별 신규확진자수 (fmax: 첫 행 NaN과 음수를 한 번에 0으로)
 df["new_confirmed"] = (
-    df.groupby("region")["confirmed"].diff().fillna(0).clip(lower=0)
+    np.fmax(df.groupby("region")["confirmed"].diff(), 0)
 )
 # 대구 지역 데이터 필터링
-df_Daegu = df[df["region"]=="Daegu"][["date", "new_confirmed"]]
+df_Daegu = df.loc[df["region"]=="Daegu", ["date", "new_confirmed"]]
 
 
 fig = go.Figure()
-fig.add_trace(go.Scatter(x=df_total.date, y=df_total.new_confirmed,
-                         mode='lines+markers', name='한국 전체 신규 확진자 수',))
+# Scattergl: 선/점을 SVG 요소 대신 WebGL로 그림 (점이 많아져도 빠름)
+fig.add_trace(go.Scattergl(x=df_total.date, y=df_total.new_confirmed,
+                           mode='lines+markers', name='한국 전체 신규 확진자 수',))
 
 fig.add_trace(go.Bar(x=df_Daegu.date, y=df_Daegu.new_confirmed,
                      name = '대구 지역 신규 확진자 수',))
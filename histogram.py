@@ -11,26 +11,27 @@ import plotly.io as pio
 
 # 데이터 전처리
 # 한국 종합 데이터
-df_total = pd.read_csv("data/kr_daily.csv")  # 한국 종합 데이터 로드
+df_total = pd.read_csv("data/kr_daily.csv", engine="pyarrow")  # 한국 종합 데이터 로드
 df_total["date"] = pd.to_datetime(df_total["date"], format="%Y%m%d") # 날짜 형식 변환 및 정렬
 df_total = df_total.sort_values("date").reset_index(drop=True) # 날짜순 정렬
 df_total["critical"] = df_total["critical"].fillna(0) # 결측치 0으로 채우기
 # 일별 증감 계산
 cols = ["confirmed", "death", "released", "tested", "negative", "critical"]
-new_cols = df_total[cols].diff() # 일별 차이는 new_를 붙혀서 새로운 컬럼으로 표현
-new_cols.columns = ["new_" + c for c in cols]
-df_total = pd.concat([df_total, new_cols], axis=1) # 기존데이터 프레임에 새로운 컬럼 추가
-df_total.fillna(0, inplace=True) # 첫 행 NaN 제거
+vals = df_total[cols].to_numpy(dtype=np.float64)
+new_vals = np.empty_like(vals)
+new_vals[0] = 0 # 첫 행은 이전 날이 없으므로 0 (NaN을 만들었다가 다시 채우지 않음)
+np.subtract(vals[1:], vals[:-1], out=new_vals[1:]) # 일별 차이는 new_를 붙혀서 새로운 컬럼으로 표현
+df_total = df_total.assign(**{"new_" + c: new_vals[:, i] for i, c in enumerate(cols)}) # 기존데이터 프레임에 새로운 컬럼 추가
 
 print(df_total.columns)
 
 # 지역별 데이터
 # 기존 전처리는 df였는데 여기서는 df_region으로 변경
-df_regoion = pd.read_csv("data/kr_regional_daily_excel.csv") # 지역별 데이터 로드
-df_regoion["date"] = pd.to_datetime(df_regoion["date"], format="%Y%m%d") # 날짜 형식 변환 
+df_regoion = pd.read_csv("data/kr_regional_daily_excel.csv", engine="pyarrow") # 지역별 데이터 로드
+df_regoion["date"] = pd.to_datetime(df_regoion["date"], format="%Y%m%d", cache=True) # 날짜 형식 변환 (지역 수만큼 반복되는 날짜는 한 번만 변환)
 df_regoion = df_regoion.sort_values(["region", "date"]).reset_index(drop=True) # 지역,날짜순 정렬
 df_regoion["new_confirmed"] = (
-    df_regoion.groupby("region")["confirmed"].diff().fillna(0).clip(lower=0) # 지역에 따른 일자별 신규확진자 컬럼 만들고 결측치 0으로 채우기
+    np.fmax(df_regoion.groupby("region")["confirmed"].diff(), 0) # 지역에 따른 일자별 신규확진자 컬럼 만들고 결측치 0으로 채우기 (fmax: NaN과 음수를 한 번에 0으로)
 )
 
 print(df_regoion.columns)
@@ -9,6 +9,11 @@ import plotly.express as px
 from rasterio import features, transform
 from scipy.ndimage import binary_dilation
 
+try:
+    import orjson  # optional: C JSON encoder for the large embedded payloads
+except ImportError:
+    orjson = None
+
 # ---------------------------------------------------------
 # 1. Configuration & Constants
 # ---------------------------------------------------------
@@ -24,6 +29,15 @@ AFF_TRANS = transform.from_origin(MIN_LON, MAX_LAT, RES_LON, RES_LAT)
 # ---------------------------------------------------------
 # 2. Helpers
 # ---------------------------------------------------------
+def to_js(obj):
+    """
+    Serialize obj for embedding in the page. NumPy arrays are accepted as-is.
+    Uses orjson when installed (NaN is written as null, which Plotly also treats as a gap).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, default=lambda o: o.tolist())
+
 def get_largest_polygon(geometry):
     """
     Keep only the largest polygon from a MultiPolygon (island filtering).
@@ -50,18 +64,19 @@ def load_data(csv_path, geojson_path):
     # Load GeoJSON
     with open(geojson_path, 'r', encoding='utf-8') as f:
         geojson = json.load(f)
-    geojson_str = json.dumps(geojson) # For embedding in JS if needed
 
-    # Load CSV
-    df = pd.read_csv(csv_path)
-    # Ensure necessary columns
+    # Load CSV (only the columns the map uses; dates stay as YYYYMMDD strings)
     required_cols = {"date", "region", "death", "confirmed"}
+    df = pd.read_csv(
+        csv_path,
+        usecols=lambda c: c in required_cols,
+        dtype={"date": str, "region": "category"},
+    )
+    # Ensure necessary columns
     if not required_cols.issubset(df.columns):
         pass
-
-    df['date'] = df['date'].astype(str)
     
-    return df, geojson, geojson_str
+    return df, geojson
 
 def process_names_and_dates(df, geojson):
     # Extract canonical names from GeoJSON (ordering matters for the mask)
@@ -89,71 +104,68 @@ def process_names_and_dates(df, geojson):
         "제주": "Jeju-do", "제주도": "Jeju-do", "제주특별자치도": "Jeju-do"
     }
 
-    # Group by date
-    date_groups_levels = {}
-    date_groups_raw = {}
-    
     dates_sorted = sorted(df['date'].unique())
     print("Processing daily data...")
     
     MAX_LEVEL = 15
     CAP_CONFIRMED = 2500000
-    
-    for date in dates_sorted:
-        day_df = df[df['date'] == date]
-        
-        # 1. Aggregate Raw Counts
-        conf_map = {r: 0 for r in regions_order}
-        for _, row in day_df.iterrows():
-            reg_raw = str(row['region'])
-            reg = region_alias.get(reg_raw, reg_raw)
-            if reg not in conf_map:
-                if f"{reg}-do" in conf_map: reg = f"{reg}-do"
-                elif f"{reg}-si" in conf_map: reg = f"{reg}-si"
-            
-            if reg in conf_map:
-                conf_map[reg] += int(row.get('confirmed', 0))
-        
-        raw_vals = [conf_map[r] for r in regions_order]
-        
-        # 2. Calculate Levels (Dynamic Relative Scaling)
-        day_max = max(raw_vals) if raw_vals else 0
-        reference_val = min(day_max, CAP_CONFIRMED)
-        
-        level_vals = []
-        for val in raw_vals:
-            if reference_val == 0:
-                lvl = 0
-            else:
-                ratio = val / reference_val
-                lvl = int(ratio * MAX_LEVEL)
-                
-                # Boundaries
-                if lvl < 1 and val > 0: lvl = 1
-                if lvl > MAX_LEVEL: lvl = MAX_LEVEL
-            
-            level_vals.append(lvl)
-        
-        date_groups_raw[date] = raw_vals
-        date_groups_levels[date] = level_vals
+
+    # Resolve each distinct CSV label to its GeoJSON name once (not per row per date)
+    known = set(regions_order)
+
+    def canonical(reg_raw):
+        reg = region_alias.get(reg_raw, reg_raw)
+        if reg not in known:
+            if f"{reg}-do" in known: reg = f"{reg}-do"
+            elif f"{reg}-si" in known: reg = f"{reg}-si"
+        return reg
+
+    # region is categorical: map its categories, never materializing a per-row string column
+    canon = df['region'].map({label: canonical(label) for label in df['region'].cat.categories})
+
+    # 1. Aggregate Raw Counts: one (date x region) table aligned to regions_order,
+    #    missing (date, region) pairs filled with 0
+    raw = (
+        df['confirmed'][canon.isin(known)]
+        .groupby([df['date'], canon], observed=True)
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(index=dates_sorted, columns=regions_order, fill_value=0)
+        .to_numpy(dtype=np.int64)
+    )
+
+    # 2. Calculate Levels (Dynamic Relative Scaling), all dates at once
+    reference_val = np.minimum(raw.max(axis=1), CAP_CONFIRMED)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        levels = np.floor(raw / reference_val * MAX_LEVEL)
+    levels = np.where(reference_val == 0, 0, levels)
+
+    # Boundaries
+    levels[(levels < 1) & (raw > 0)] = 1
+    levels = np.minimum(levels, MAX_LEVEL).astype(np.int64)
+
+    date_groups_raw = dict(zip(dates_sorted, raw.tolist()))
+    date_groups_levels = dict(zip(dates_sorted, levels.tolist()))
 
     return regions_order, dates_sorted, date_groups_levels, date_groups_raw
 
 def generate_base_grid(geojson, regions_order):
     print("Generating 3D Base Grid...")
-    grid = np.full(GRID_SHAPE, -1, dtype=np.int32)
-    
-    for idx, region_name in enumerate(regions_order):
-        feature = next(f for f in geojson['features'] if f['properties']['CTP_ENG_NM'] == region_name)
-        geom = get_largest_polygon(feature['geometry'])
-        mask = features.rasterize(
-            [(geom, 1)],
-            out_shape=GRID_SHAPE,
-            transform=AFF_TRANS,
-            fill=0,
-            dtype='uint8'
-        )
-        grid[mask == 1] = idx
+    features_by_name = {f['properties']['CTP_ENG_NM']: f for f in geojson['features']}
+    shapes = [
+        (get_largest_polygon(features_by_name[region_name]['geometry']), idx)
+        for idx, region_name in enumerate(regions_order)
+    ]
+
+    # Burn every region in one GDAL pass (later shapes overwrite earlier ones,
+    # same as the previous per-region masks)
+    grid = features.rasterize(
+        shapes,
+        out_shape=GRID_SHAPE,
+        transform=AFF_TRANS,
+        fill=-1,
+        dtype='int32'
+    )
 
     valid_mask = grid >= 0
     shoreline_mask = binary_dilation(valid_mask, iterations=1) & ~valid_mask
@@ -164,7 +176,7 @@ def generate_base_grid(geojson, regions_order):
 # ---------------------------------------------------------
 # 4. HTML Generation
 # ---------------------------------------------------------
-def generate_html(output_path, regions_order, dates, levels_data, raw_data, base_grid, geojson, geojson_str):
+def generate_html(output_path, regions_order, dates, levels_data, raw_data, base_grid, geojson):
     print("Generating HTML...")
     base_grid_flat = base_grid.flatten()
     init_date = dates[-1]
@@ -190,14 +202,12 @@ def generate_html(output_path, regions_order, dates, levels_data, raw_data, base
     z_matrix[mask_sea] = 0
     z_matrix[mask_region] = levels[base_grid[mask_region]]
     
-    # Plotly expects list of lists for Surface Z
-    z_list = z_matrix.tolist()
-    
+    # Arrays are serialized directly by to_js (no intermediate Python lists)
     trace3d = {
         "type": "surface",
-        "z": z_list,
-        "x": x_coords.tolist(),
-        "y": y_coords.tolist(),
+        "z": z_matrix,
+        "x": x_coords,
+        "y": y_coords,
         "colorscale": [
             [0, "#6bb5ff"],
             [0.4, "#b590b5"],
@@ -306,9 +316,9 @@ def generate_html(output_path, regions_order, dates, levels_data, raw_data, base
     }
 
     # Serialize to JSON for Injection
-    initial_data_json = json.dumps(initial_data)
-    layout_json = json.dumps(layout)
-    base_grid_flat_json = json.dumps(base_grid_flat.tolist()) # Flattened list for JS Array
+    initial_data_json = to_js(initial_data)
+    layout_json = to_js(layout)
+    base_grid_flat_json = to_js(base_grid_flat) # Flattened list for JS Array
     
     html_content = f"""<!DOCTYPE html>
 <html lang="ko">
@@ -354,10 +364,10 @@ def generate_html(output_path, regions_order, dates, levels_data, raw_data, base
         const initialLayout = {layout_json};
         
         // Data needed for dynamic updates
-        const regions = {json.dumps(regions_order)};
-        const dates = {json.dumps(dates)};
-        const levelsData = {json.dumps(levels_data)}; // Date -> [Level array 1-15]
-        const rawData = {json.dumps(raw_data)};       // Date -> [Raw Count array]
+        const regions = {to_js(regions_order)};
+        const dates = {to_js(dates)};
+        const levelsData = {to_js(levels_data)}; // Date -> [Level array 1-15]
+        const rawData = {to_js(raw_data)};       // Date -> [Raw Count array]
         
         const baseGrid = new Int8Array({base_grid_flat_json}); 
         
@@ -456,11 +466,11 @@ def main():
         
     print(f"CSV Path: {csv_path}")
     
-    df, geojson, geojson_str = load_data(csv_path, geojson_path)
+    df, geojson = load_data(csv_path, geojson_path)
     regions_order, dates, levels_data, raw_data = process_names_and_dates(df, geojson)
     base_grid = generate_base_grid(geojson, regions_order)
     # Pass geojson object too for python trace construction
-    generate_html(script_dir / args.output, regions_order, dates, levels_data, raw_data, base_grid, geojson, geojson_str)
+    generate_html(script_dir / args.output, regions_order, dates, levels_data, raw_data, base_grid, geojson)
 
 if __name__ == "__main__":
     main()
@@ -13,12 +13,17 @@ def build(html_out: Path, csv_path: Path, geojson_path: Path, initial_date: int
     if not geojson_path.exists():
         raise FileNotFoundError(geojson_path)
 
-    df = pd.read_csv(csv_path)
+    df = pd.read_csv(
+        csv_path,
+        usecols=lambda c: c in {"date", "region", "death"},
+        dtype={"region": "category"},
+    )
     if not {"date", "region", "death"}.issubset(df.columns):
         raise ValueError("CSV must contain columns: date, region, death")
 
-    geojson = json.loads(geojson_path.read_text(encoding="utf-8"))
+    # Read the GeoJSON once: the raw text is embedded in the page, the parsed copy drives the figure
     geojson_js = geojson_path.read_text(encoding="utf-8")
+    geojson = json.loads(geojson_js)
     regions_order = [f["properties"]["CTP_ENG_NM"] for f in geojson["features"]]
 
     # Region name aliases (CSV may use shortened Korean names)
@@ -73,20 +78,30 @@ def build(html_out: Path, csv_path: Path, geojson_path: Path, initial_date: int
         "제주도": "Jeju-do",
     }
 
+    # Resolve each distinct CSV label to its GeoJSON name once (not per row)
+    known = set(regions_order)
+
+    def canonical(reg: str) -> str:
+        reg = region_alias.get(reg, reg)
+        if reg not in known and f"{reg}-do" in known:
+            reg = f"{reg}-do"
+        if reg not in known and f"{reg}-si" in known:
+            reg = f"{reg}-si"
+        return reg
+
+    # region is categorical: map its categories, never materializing a per-row string column
+    canon = df["region"].map({label: canonical(label) for label in df["region"].cat.categories})
+
     # Precompute deaths per region per date aligned to regions_order
-    date_groups = {}
-    for date, g in df.groupby("date", sort=True):
-        deaths = {r: 0 for r in regions_order}
-        for _, row in g.iterrows():
-            reg = str(row["region"])
-            reg = region_alias.get(reg, reg)
-            if reg not in deaths and f"{reg}-do" in deaths:
-                reg = f"{reg}-do"
-            if reg not in deaths and f"{reg}-si" in deaths:
-                reg = f"{reg}-si"
-            if reg in deaths:
-                deaths[reg] += int(row["death"])
-        date_groups[str(int(date))] = [deaths[r] for r in regions_order]
+    deaths = (
+        df["death"][canon.isin(known)]
+        .groupby([df["date"], canon], observed=True)
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(index=sorted(df["date"].unique()), columns=regions_order, fill_value=0)
+        .astype(int)
+    )
+    date_groups = {str(int(date)): vals for date, vals in zip(deaths.index, deaths.to_numpy().tolist())}
 
     dates_sorted = sorted(date_groups.keys())
     if not dates_sorted:
@@ -181,11 +196,14 @@ def build(html_out: Path, csv_path: Path, geojson_path: Path, initial_date: int
         status.style.display = 'inline';
         return;
       }}
-      const total = vals.reduce((a,b)=>a+b,0);
+      // One pass for both the total and the max (no argument spread)
+      let total = 0, localMax = 1;
+      for (const v of vals) {{
+        total += v;
+        if (v > localMax) localMax = v;
+      }}
       status.style.display = total === 0 ? 'inline' : 'none';
 
-      const localMax = Math.max(...vals, 1);
-
       const data = [{{
         type: 'choropleth',
         locations: regions,
@@ -21,20 +21,20 @@ import plotly.io as pio
 def load_data(csv_path: Path) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV not found: {csv_path}")
-    df = pd.read_csv(csv_path)
+    # Check the header first so parse_dates below cannot fail on a missing column
     required = {"date", "region", "confirmed"}
-    missing = required - set(df.columns)
+    missing = required - set(pd.read_csv(csv_path, nrows=0).columns)
     if missing:
         raise ValueError(f"Missing columns in CSV: {', '.join(sorted(missing))}")
-    return df
+    # Parse YYYYMMDD dates during the CSV scan instead of a second pass afterwards
+    return pd.read_csv(csv_path, usecols=sorted(required), parse_dates=["date"], date_format="%Y%m%d")
 
 
 def build_html(df: pd.DataFrame, output_file: Path) -> Path:
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"].astype(str), format="%Y%m%d")
+    # sort_values already returns a new frame, so the caller's df is never mutated
+    df = df.sort_values(["region", "date"])
 
     # 일자별 신규 확진자 계산: 지역별 누적값 차분, 감소 구간은 0으로 클립
-    df = df.sort_values(["region", "date"])
     df["daily_new"] = (
         df.groupby("region")["confirmed"]
         .diff()
@@ -42,19 +42,18 @@ def build_html(df: pd.DataFrame, output_file: Path) -> Path:
         .clip(lower=0)
     )
 
-    # Week start (Monday) and labels
-    df["week_start"] = df["date"] - pd.to_timedelta(df["date"].dt.weekday, unit="d")
-    df["week_end"] = df["week_start"] + pd.Timedelta(days=6)
-    df["week_key"] = df["week_start"].dt.strftime("%Y%m%d")
-    df["week_display"] = (
-        df["week_start"].dt.year.astype(str)
+    # Week start (Monday); keys and labels are built once per distinct week, not per row
+    week_codes, weeks = pd.factorize(df["date"] - pd.to_timedelta(df["date"].dt.weekday, unit="d"), sort=True)
+    week_keys = weeks.strftime("%Y%m%d")
+    week_display = (
+        weeks.year.astype(str)
         + "년 "
-        + df["week_start"].dt.month.astype(str)
+        + weeks.month.astype(str)
         + "월 "
-        + (((df["week_start"].dt.day - 1) // 7) + 1).astype(str)
+        + (((weeks.day - 1) // 7) + 1).astype(str)
         + "째주"
     )
-    df["week_range"] = df["week_start"].dt.strftime("%Y-%m-%d") + "~" + df["week_end"].dt.strftime("%Y-%m-%d")
+    week_range = weeks.strftime("%Y-%m-%d") + "~" + (weeks + pd.Timedelta(days=6)).strftime("%Y-%m-%d")
 
     regions = sorted(df["region"].unique())
 
@@ -81,15 +80,21 @@ def build_html(df: pd.DataFrame, output_file: Path) -> Path:
     }
     color_map = {region: fixed_colors.get(region, "#999999") for region in regions}
 
+    # Weekly totals for every (week, region) in one groupby: rows = weeks, columns = regions
+    weekly = (
+        df["daily_new"]
+        .groupby([week_codes, df["region"]])
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(columns=regions, fill_value=0)
+    )
     data_map = {}
-    for wk, g in df.groupby("week_key"):
-        g_sum = g.groupby("region")["daily_new"].sum()
-        values = [int(g_sum.get(r, 0)) for r in regions]
-        data_map[wk] = {
+    for code, values in zip(weekly.index, weekly.to_numpy().tolist()):
+        data_map[week_keys[code]] = {
             "labels": regions,
-            "values": values,
-            "display_text": g["week_display"].iloc[0],
-            "range_text": g["week_range"].iloc[0],
+            "values": [int(v) for v in values],
+            "display_text": week_display[code],
+            "range_text": week_range[code],
         }
 
     weeks_sorted = sorted(data_map.keys())
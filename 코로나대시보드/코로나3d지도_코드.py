@@ -16,10 +16,11 @@ with open(geojson_path, 'r', encoding='utf-8') as f:
     sk_geojson = json.load(f)
 
 df = pd.read_csv(csv_path)
-df['date'] = df['date'].astype(str)
-latest_date = df['date'].max()
+# Compare the integer YYYYMMDD column directly; only the picked date is turned into a string
+latest = df['date'].max()
+latest_date = str(latest)
 print(f"Using COVID data from: {latest_date}")
-latest_df = df[df['date'] == latest_date]
+latest_df = df[df['date'] == latest]
 covid_data = latest_df.set_index('region')['confirmed'].to_dict()
 
 # Name Mapping
@@ -80,40 +81,36 @@ def get_largest_polygon(geometry):
         }
     return geometry
 
-max_level = 0
+# Korean map name -> case count (one dict lookup per feature instead of scanning name_map)
+cases_by_kor = {map_name: covid_data.get(csv_name, 0) for csv_name, map_name in name_map.items()}
 
+shapes = []
 for feature in sk_geojson['features']:
     kor_name = feature['properties'].get('CTP_KOR_NM')
-    
-    # Find case count
-    case_count = 0
-    for csv_name, map_name in name_map.items():
-        if map_name == kor_name:
-            if csv_name in covid_data:
-                case_count = covid_data[csv_name]
-            break
-            
+    case_count = cases_by_kor.get(kor_name, 0)
+
     # Calculate Step Level
     level = get_height_level(case_count)
-    if level > max_level:
-        max_level = level
-        
+
     # Simplify Geometry: Keep only the largest block (island filtering)
     # BUT DO NOT APPLY SHAPELY SIMPLIFICATION (FLATTENING)
     largest_geometry = get_largest_polygon(feature['geometry'])
-    
-    # Use largest_geometry directly for rasterization
-    shapes = [(largest_geometry, 1)]
-    mask = features.rasterize(
-        shapes=shapes,
-        out_shape=(height, width),
-        transform=aff_trans,
-        fill=0,
-        dtype='uint8'
-    )
-    
-    # Update grid where mask is 1
-    elevation[mask == 1] = level
+    shapes.append((largest_geometry, level))
+
+max_level = max((level for _, level in shapes), default=0)
+
+# Burn every province into the grid with a single rasterize call
+# (shapes are burned in order, so later provinces overwrite earlier ones exactly as before;
+#  levels start at 1, so 0 marks cells outside every province)
+levels = features.rasterize(
+    shapes=shapes,
+    out_shape=(height, width),
+    transform=aff_trans,
+    fill=0,
+    dtype='float32'
+)
+inside = levels > 0
+elevation[inside] = levels[inside]
 
 print(f"Max Level: {max_level}")
 
@@ -7,7 +7,7 @@ file_path = 'kr_regional_daily_excel.csv'
 df = pd.read_csv(file_path)
 
 target_date = 20230904
-daily_df = df[df['date'] == target_date].copy()
+daily_df = df[df['date'] == target_date]
 
 # Translate English regions to Korean
 korean_mapping = {
@@ -18,9 +18,8 @@ korean_mapping = {
     'Jeju': '제주', 'Quarantine': '검역'
 }
 
-# Apply mapping
-daily_df['region_kr'] = daily_df['region'].map(korean_mapping)
-original_data = daily_df.set_index('region_kr')['confirmed'].to_dict()
+# Apply mapping (used directly as the index, so the filtered frame is never written to or copied)
+original_data = daily_df.set_index(daily_df['region'].map(korean_mapping))['confirmed'].to_dict()
 
 def calculate_weight(count):
     if count < 500000: